@@ -174,9 +174,9 @@ def prompt_food_selection(kb: NutritionKnowledgeBase, matcher: FoodMatcher) -> O
     
     # Step 1: Check for exact match (case-insensitive, whitespace-tolerant)
     normalized_query = normalize_food_name(query)
-    all_foods = kb.list_all_foods()
+    num_foods = len(kb)
     
-    if normalized_query in all_foods:
+    if kb.has_food(normalized_query):
         # Exact match found - return immediately without prompting
         return normalized_query
     
@@ -200,7 +200,7 @@ def prompt_food_selection(kb: NutritionKnowledgeBase, matcher: FoodMatcher) -> O
         # Prompt user
         print(f"\nOptions:")
         print(f"  Enter 1-{len(neighbors)} to select a food")
-        if offset + top_k < len(kb.list_all_foods()):
+        if offset + top_k < num_foods:
             print(f"  Enter 'next' to see next {top_k} options")
         print(f"  Enter 'cancel' to start over")
         
@@ -232,9 +232,9 @@ def select_food_by_query(query: str, kb: NutritionKnowledgeBase, matcher: FoodMa
     - Returns a normalized food name from the KB, or None if cancelled / no match
     """
     normalized_query = normalize_food_name(query)
-    all_foods = kb.list_all_foods()
+    num_foods = len(kb)
 
-    if normalized_query in all_foods:
+    if kb.has_food(normalized_query):
         return normalized_query
 
     offset = 0
@@ -253,7 +253,7 @@ def select_food_by_query(query: str, kb: NutritionKnowledgeBase, matcher: FoodMa
 
         print(f"\nOptions:")
         print(f"  Enter 1-{len(neighbors)} to select a food")
-        if offset + top_k < len(kb.list_all_foods()):
+        if offset + top_k < num_foods:
             print(f"  Enter 'next' to see next {top_k} options")
         print(f"  Enter 'cancel' to start over")
 
@@ -509,7 +509,7 @@ def main():
     print(f"\nLoading knowledge base from {csv_path}...")
     try:
         kb = NutritionKnowledgeBase(csv_path)
-        print(f"Loaded {len(kb.list_all_foods())} foods.")
+        print(f"Loaded {len(kb)} foods.")
     except FileNotFoundError:
         print(f"Error: Could not find {csv_path}")
         print("Please ensure the nutrition data CSV file exists.")
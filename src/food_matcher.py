@@ -3,12 +3,20 @@ Food Name Matcher: Uses word embeddings to find similar food names.
 
 We implement word embeddings via the sentence-transformers library (e.g. SentenceTransformer
 with model 'all-MiniLM-L6-v2'). Food names are encoded into dense vectors; similarity is
-computed with cosine similarity for efficient nearest-neighbor search. If sentence-transformers
-is not installed, the matcher falls back to token-based matching.
+computed with cosine similarity for efficient nearest-neighbor search. The model runs on the
+ONNX Runtime backend with INT8-quantized weights when available
+(``pip install "sentence-transformers[onnx]"``), which is noticeably faster on CPU than eager
+PyTorch; otherwise the default backend is used. If sentence-transformers is not installed,
+the matcher falls back to token-based matching.
 """
 
+import hashlib
+import os
 import re
-from typing import List, Tuple, Optional, Set
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Tuple, Optional, Set
 import numpy as np
 
 try:
@@ -18,6 +26,16 @@ except ImportError:
     SENTENCE_TRANSFORMERS_AVAILABLE = False
     print("Warning: sentence-transformers not installed. Install with: pip install sentence-transformers")
 
+# Relative embedding cache directories resolve here, not against the working directory.
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Optional SIMD similarity kernels (pip install simsimd); NumPy is used otherwise.
+try:
+    import simsimd
+    SIMSIMD_AVAILABLE = True
+except ImportError:
+    SIMSIMD_AVAILABLE = False
+
 
 class FoodMatcher:
     """
@@ -25,7 +43,8 @@ class FoodMatcher:
     
     When use_embeddings is True and sentence-transformers is installed, encodes all food
     names with a SentenceTransformer model (word/sentence embeddings) and performs
-    nearest-neighbor search via cosine similarity.
+    nearest-neighbor search via cosine similarity. The model and corpus embeddings are
+    loaded lazily, on the first query that needs them.
 
     To avoid generic terms (e.g. "sauce") dominating results, we apply a
     lightweight token-based re-ranking that boosts candidates matching the
@@ -62,6 +81,18 @@ class FoodMatcher:
         "sauces": {"pureed", "puree"},
     }
 
+    # Prebuilt INT8 export shipped with all-MiniLM-L6-v2 (VNNI dot products on x86).
+    _ONNX_QUANTIZED_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+    _SUPPORTED_PRECISIONS = ("float32", "float16", "int8")
+
+    # Rows upcast at a time by the float16 NumPy path (a 1024 x 384 float32 block is
+    # 1.5 MiB), so that path never holds a float32 copy of the whole corpus.
+    _FLOAT16_BLOCK_ROWS = 1024
+
+    # Recent query embeddings kept for pagination / repeated lookups.
+    _QUERY_CACHE_SIZE = 128
+
     @classmethod
     def _tokenize(cls, text: str) -> Set[str]:
         return set(cls._TOKEN_RE.findall((text or "").lower()))
@@ -81,9 +112,40 @@ class FoodMatcher:
 
         return core_tokens, preferred_tokens
 
+    @classmethod
+    def _load_model(cls, model_name: str):
+        """Load the embedding model, preferring the INT8 ONNX weights.
+
+        Tries the quantized ONNX export first, then the FP32 ONNX export, then the
+        default PyTorch backend. The same model encodes both the corpus and queries,
+        so the embedding space stays consistent whichever variant loads.
+
+        Returns:
+            (model, variant) where variant names the weights that loaded:
+            "onnx-int8", "onnx" or "default".
+        """
+        try:
+            model = SentenceTransformer(
+                model_name,
+                backend="onnx",
+                model_kwargs={"file_name": cls._ONNX_QUANTIZED_FILE},
+            )
+            return model, "onnx-int8"
+        except (ImportError, TypeError, ValueError, OSError):
+            pass
+        try:
+            return SentenceTransformer(model_name, backend="onnx"), "onnx"
+        except (ImportError, TypeError, ValueError, OSError) as exc:
+            # Older sentence-transformers releases reject `backend`; missing
+            # onnxruntime/optimum raises on load. Either way, use the default.
+            print(f"Warning: ONNX backend unavailable ({exc}); using default backend.")
+            return SentenceTransformer(model_name), "default"
+
     def __init__(self, food_names: List[str], 
                  model_name: str = "all-MiniLM-L6-v2",
-                 use_embeddings: bool = True):
+                 use_embeddings: bool = True,
+                 cache_dir: Optional[str] = ".cache",
+                 precision: str = "float32"):
         """Initialize food matcher.
         
         Args:
@@ -92,38 +154,294 @@ class FoodMatcher:
                         Default: "all-MiniLM-L6-v2" (~80MB).
             use_embeddings: If True, use sentence-transformers for word embeddings; if False
                            or library missing, fall back to simple substring matching.
+            cache_dir: Directory for the on-disk corpus embedding cache (keyed by a hash of
+                       the model name, loaded weights variant, precision and food list).
+                       Relative paths resolve against the project root. None disables
+                       the cache.
+            precision: In-memory precision of the corpus matrix used for similarity.
+                       "float32" (default), "float16" (half the memory, upcast to
+                       float32 for the product) or "int8" (scale-127 quantization of
+                       the normalized vectors: 4x smaller, approximate cosine scores).
         
         Raises:
             ImportError: If sentence-transformers not installed and use_embeddings=True.
+            ValueError: If precision is not one of the supported values.
         """
+        if precision not in self._SUPPORTED_PRECISIONS:
+            raise ValueError(
+                f"precision must be one of {self._SUPPORTED_PRECISIONS}, got {precision!r}"
+            )
         self.food_names = food_names
+        self.model_name = model_name
         self.use_embeddings = use_embeddings and SENTENCE_TRANSFORMERS_AVAILABLE
+        self.precision = precision
+        self.model = None
+        # Weights variant reported by _load_model (part of the embedding cache key).
+        self._model_variant: Optional[str] = None
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        # ((query, top_k), ranked prefix, adjusted scores) of the last query; later
+        # pages of the same query slice the prefix, extending it when they run past it.
+        self._last_ranking: Optional[Tuple[Tuple[str, int], np.ndarray, np.ndarray]] = None
 
+        self._lower_names: List[str] = [name.lower() for name in food_names]
         # Precompute token sets for token-based re-ranking / fallback scoring.
         self._food_token_sets: List[Set[str]] = [self._tokenize(name) for name in food_names]
+        # Inverted index token -> food ids, so scoring only visits foods sharing a token.
+        postings: Dict[str, List[int]] = {}
+        for i, token_set in enumerate(self._food_token_sets):
+            for token in token_set:
+                postings.setdefault(token, []).append(i)
+        self._token_postings: Dict[str, np.ndarray] = {
+            token: np.array(ids, dtype=np.intp) for token, ids in postings.items()
+        }
         
-        if self.use_embeddings:
-            print(f"Loading embedding model: {model_name}...")
-            self.model = SentenceTransformer(model_name)
-            print("Pre-computing food name embeddings...")
-            # Pre-compute embeddings for all foods
-            self.food_embeddings = self.model.encode(
-                food_names,
-                show_progress_bar=False,
-                convert_to_numpy=True,
-                batch_size=32
-            )
-            # Normalize for fast cosine similarity
-            self._normalized_embeddings = (
-                self.food_embeddings / np.linalg.norm(self.food_embeddings, axis=1, keepdims=True)
+        # Corpus vectors (and the model) are loaded on the first embedding query, so
+        # exact-match lookups in the CLI never pay the model load or corpus encode.
+        self._cache_dir: Optional[Path] = None
+        if cache_dir is not None:
+            self._cache_dir = _PROJECT_ROOT / cache_dir  # absolute paths pass through
+        # L2-normalized corpus matrix, stored in the requested precision.
+        self.food_embeddings: Optional[np.ndarray] = None
+        if use_embeddings and not self.use_embeddings:
+            print("Warning: Falling back to token-based matching.")
+
+    @staticmethod
+    def _embedding_cache_path(
+        cache_dir: Optional[Path],
+        model_name: str,
+        variant: str,
+        precision: str,
+        food_names: List[str],
+    ) -> Optional[Path]:
+        """Return the .npy cache file for this model variant + precision + food list.
+
+        Returns None if the cache is disabled.
+        """
+        if cache_dir is None:
+            return None
+        # Hash the names in order: cached rows must line up with ``food_names``.
+        key_source = "\n".join([model_name, variant, precision, *food_names])
+        digest = hashlib.sha1(key_source.encode("utf-8")).hexdigest()[:16]
+        return cache_dir / f"food_emb_{digest}.npy"
+
+    @staticmethod
+    def _save_embedding_cache(cache_path: Path, embeddings: np.ndarray) -> None:
+        """Write normalized embeddings to disk; a failed write only costs the next startup.
+
+        The array goes to a temporary file that is renamed into place, so an
+        interrupted write never leaves a truncated cache behind.
+        """
+        tmp_name = None
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=cache_path.parent, suffix=".tmp", delete=False
+            ) as tmp:
+                tmp_name = tmp.name
+                np.save(tmp, embeddings)
+            os.replace(tmp_name, cache_path)
+        except OSError as exc:
+            print(f"Warning: could not write embedding cache ({exc}).")
+            if tmp_name is not None and os.path.exists(tmp_name):
+                os.remove(tmp_name)
+
+    def _load_embedding_cache(self, cache_path: Path) -> Optional[np.ndarray]:
+        """Memory-map cached embeddings, or None if the file is missing or unusable."""
+        try:
+            embeddings = np.load(cache_path, mmap_mode="r")
+        except (OSError, ValueError):
+            # Missing, truncated or not an .npy file: re-encode and overwrite it.
+            return None
+        if (
+            embeddings.ndim != 2
+            or embeddings.shape[0] != len(self.food_names)
+            or embeddings.dtype != np.dtype(self.precision)
+        ):
+            return None
+        return embeddings
+
+    @staticmethod
+    def _quantize_int8(normalized: np.ndarray) -> np.ndarray:
+        """Map unit-length vectors to int8 (components in [-1, 1] scaled by 127)."""
+        return np.clip(np.rint(normalized * 127.0), -127, 127).astype(np.int8)
+
+    def _corpus_similarities(self, query_normalized: np.ndarray) -> np.ndarray:
+        """Cosine similarity of the query against every food (float32, one per food)."""
+        corpus = self._ensure_embeddings()
+        if self.precision == "int8":
+            query_normalized = self._quantize_int8(query_normalized)
+        elif self.precision == "float16":
+            query_normalized = query_normalized.astype(np.float16)
+        if SIMSIMD_AVAILABLE:
+            # Single-query shape (N, 384) x (384,) is where NumPy dispatch overhead
+            # dominates; simsimd runs a dedicated SIMD kernel for each precision.
+            distances = simsimd.cdist(
+                query_normalized[None, :], corpus, metric="cosine"
             )
-            print(f"Embeddings computed for {len(food_names)} foods.")
-        else:
-            self.model = None
-            self.food_embeddings = None
-            if use_embeddings:
-                print("Warning: Falling back to token-based matching.")
+            return (1.0 - np.asarray(distances).ravel()).astype(np.float32)
+        if self.precision == "int8":
+            # Accumulate in int32: 384 products of up to 127*127 overflow int16.
+            dots = np.matmul(corpus, query_normalized, dtype=np.int32)
+            return dots.astype(np.float32) / np.float32(127 * 127)
+        if self.precision == "float16":
+            # NumPy has no half-precision BLAS: upcast one block of rows at a time
+            # for an SGEMV, writing each block's scores straight into the output.
+            query32 = query_normalized.astype(np.float32)
+            scores = np.empty(len(corpus), dtype=np.float32)
+            block = self._FLOAT16_BLOCK_ROWS
+            for lo in range(0, len(corpus), block):
+                np.dot(corpus[lo:lo + block].astype(np.float32), query32, out=scores[lo:lo + block])
+            return scores
+        return np.dot(corpus, query_normalized)
+
+    def _encode_query(self, query_lower: str) -> np.ndarray:
+        """Return the normalized embedding for a query, reusing recent encodes.
+
+        "Next 5" pagination repeats the same query, so a small LRU cache turns those
+        calls into a dot product instead of a transformer forward pass.
+        """
+        cached = self._query_cache.get(query_lower)
+        if cached is not None:
+            self._query_cache.move_to_end(query_lower)
+            return cached
+
+        self._ensure_model()
+        # Narrow types for static checkers: _ensure_model always sets self.model.
+        assert self.model is not None
+        query_embedding = self.model.encode([query_lower], convert_to_numpy=True)[0]
+        query_normalized = (
+            query_embedding / np.sqrt(np.vdot(query_embedding, query_embedding))
+        ).astype(np.float32, copy=False)
+
+        self._query_cache[query_lower] = query_normalized
+        if len(self._query_cache) > self._QUERY_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+        return query_normalized
+
+    def _ensure_embeddings(self) -> np.ndarray:
+        """Load (from the disk cache) or encode the normalized corpus matrix once.
+
+        Returns self.food_embeddings, so callers get a non-None array.
+        """
+        if self.food_embeddings is not None:
+            return self.food_embeddings
+        # The query is encoded right after this anyway, and the cache key depends
+        # on which weights variant the model loaded.
+        self._ensure_model()
+        assert self.model is not None and self._model_variant is not None
+        cache_path = self._embedding_cache_path(
+            self._cache_dir, self.model_name, self._model_variant, self.precision,
+            self.food_names,
+        )
+        cached = self._load_embedding_cache(cache_path) if cache_path is not None else None
+        if cached is not None:
+            # Cached vectors are already L2-normalized and stored in self.precision.
+            self.food_embeddings = cached
+            print(f"Loaded cached embeddings for {len(self.food_names)} foods.")
+            return cached
+
+        print("Pre-computing food name embeddings...")
+        # Pre-compute embeddings for all foods. encode() already length-sorts
+        # its input before batching and restores the order afterwards, so
+        # batches are padded to similar lengths without sorting here.
+        # Pinned to float32 so the similarity GEMV runs in single precision.
+        embeddings = self.model.encode(
+            self.food_names,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+            batch_size=32
+        ).astype(np.float32, copy=False)
+        # Normalize in place (row norms in a single einsum pass); only the
+        # normalized matrix is kept.
+        embeddings /= np.sqrt(np.einsum("ij,ij->i", embeddings, embeddings))[:, None]
+        if self.precision == "int8":
+            embeddings = self._quantize_int8(embeddings)
+        elif self.precision == "float16":
+            embeddings = embeddings.astype(np.float16)
+        self.food_embeddings = embeddings
+        print(f"Embeddings computed for {len(self.food_names)} foods.")
+        if cache_path is not None:
+            self._save_embedding_cache(cache_path, embeddings)
+        return embeddings
+
+    def _ensure_model(self) -> None:
+        """Load the embedding model if it has not been loaded yet."""
+        if self.model is None:
+            print(f"Loading embedding model: {self.model_name}...")
+            self.model, self._model_variant = self._load_model(self.model_name)
     
+    def _token_hit_counts(self, tokens: Set[str]) -> np.ndarray:
+        """Number of `tokens` contained in each food's token set (one count per food)."""
+        counts = np.zeros(len(self.food_names), dtype=np.float32)
+        for token in tokens:
+            ids = self._token_postings.get(token)
+            if ids is not None:
+                counts[ids] += 1.0
+        return counts
+
+    def _substring_matches(self, query_lower: str, top_k: int) -> List[int]:
+        """Ids of foods containing the query, if there are between 1 and top_k of them.
+
+        Ordered by len(query) / len(name) (an exact match first), so a clean
+        substring query is answered without encoding it. Returns [] otherwise.
+        """
+        hits: List[int] = []
+        for i, name in enumerate(self._lower_names):
+            if query_lower in name:
+                hits.append(i)
+                if len(hits) > top_k:
+                    return []
+        # Stable sort: equal-length names keep corpus order.
+        hits.sort(key=lambda i: len(self._lower_names[i]))
+        return hits
+
+    def _rerank_scores(
+        self, query_normalized: np.ndarray, core_tokens: Set[str], preferred_tokens: Set[str]
+    ) -> np.ndarray:
+        """Cosine similarities adjusted by query core/preferred token overlap."""
+        # Compute cosine similarity (fast vectorized operation)
+        similarities = self._corpus_similarities(query_normalized)
+
+        # Token-based re-ranking:
+        # - boost candidates that match query core tokens
+        # - optionally prefer interpreting generic modifiers (e.g. sauce -> pureed)
+        CORE_SCORE_WEIGHT = 1.5
+        PREFERRED_SCORE_WEIGHT = 0.5
+        CORE_MISS_PENALTY = 0.75
+
+        adjusted_scores = similarities.astype(np.float32, copy=True)
+        if core_tokens:
+            core_hits = self._token_hit_counts(core_tokens)
+            adjusted_scores += (CORE_SCORE_WEIGHT / len(core_tokens)) * core_hits
+            if preferred_tokens:
+                preferred_hits = self._token_hit_counts(preferred_tokens)
+                adjusted_scores += (PREFERRED_SCORE_WEIGHT / len(preferred_tokens)) * preferred_hits
+            adjusted_scores[core_hits == 0] -= CORE_MISS_PENALTY
+        return adjusted_scores
+
+    @staticmethod
+    def _top_ranked(scores: np.ndarray, count: int) -> np.ndarray:
+        """Ids of the `count` highest scores, best first, ties in corpus order.
+
+        Selects with an O(N) argpartition and sorts only the selected ids, so a
+        page costs O(N + count log count) rather than a full sort of the corpus.
+        """
+        n = len(scores)
+        count = min(count, n)
+        if count <= 0:
+            return np.empty(0, dtype=np.intp)
+        if count < n:
+            ids = np.argpartition(scores, n - count)[n - count:]
+            kth = scores[ids].min()
+            # argpartition picks arbitrary ids among ties at the boundary; take the
+            # lowest corpus ids instead, as a stable full sort would.
+            above = ids[scores[ids] > kth]
+            ties = np.flatnonzero(scores == kth)[:count - len(above)]
+            ids = np.concatenate([above, ties])
+        else:
+            ids = np.arange(n)
+        return ids[np.lexsort((ids, -scores[ids]))]
+
     def find_nearest_neighbors(self, query: str, top_k: int = 5, 
                               offset: int = 0) -> List[Tuple[str, float]]:
         """Find nearest neighbors using word-embedding (sentence-transformers) similarity.
@@ -137,7 +455,9 @@ class FoodMatcher:
             List of (food_name, score) tuples, sorted by best score first.
             When embeddings are enabled, `score` is an adjusted cosine similarity
             that is re-ranked using query "core" tokens (so generic terms like
-            "sauce" don't dominate results).
+            "sauce" don't dominate results). If between 1 and top_k foods contain
+            the query as a substring, the first page is just those foods, scored
+            by len(query) / len(name); later pages continue with the other foods.
         """
         query_lower = query.lower().strip()
         core_tokens, preferred_tokens = self._extract_core_and_preferred_tokens(query_lower)
@@ -145,61 +465,68 @@ class FoodMatcher:
         preferred_len = len(preferred_tokens)
         
         if self.use_embeddings:
-            # Narrow types for static checkers: self.model is only set when embeddings are enabled.
-            assert self.model is not None
-            # Encode query
-            query_embedding = self.model.encode([query_lower], convert_to_numpy=True)[0]
-            query_normalized = query_embedding / np.linalg.norm(query_embedding)
-            
-            # Compute cosine similarity (fast vectorized operation)
-            similarities = np.dot(self._normalized_embeddings, query_normalized)
-
-            # Token-based re-ranking:
-            # - boost candidates that match query core tokens
-            # - optionally prefer interpreting generic modifiers (e.g. sauce -> pureed)
-            CORE_SCORE_WEIGHT = 1.5
-            PREFERRED_SCORE_WEIGHT = 0.5
-            CORE_MISS_PENALTY = 0.75
-
-            adjusted_scores = similarities.astype(np.float32, copy=True)
-            if core_len > 0:
-                for i, token_set in enumerate(self._food_token_sets):
-                    core_hit_count = len(core_tokens.intersection(token_set))
-                    core_score = core_hit_count / core_len
-                    preferred_score = (
-                        len(token_set.intersection(preferred_tokens)) / preferred_len
-                        if preferred_len > 0
-                        else 0.0
-                    )
-                    penalty = CORE_MISS_PENALTY if core_hit_count == 0 else 0.0
-                    adjusted_scores[i] = (
-                        adjusted_scores[i]
-                        + (CORE_SCORE_WEIGHT * core_score)
-                        + (PREFERRED_SCORE_WEIGHT * preferred_score)
-                        - penalty
-                    )
-            
-            # Get top-k results (using argpartition for efficiency)
-            total_results = min(top_k + offset, len(self.food_names))
-            top_indices = np.argpartition(adjusted_scores, -total_results)[-total_results:]
-            top_indices = top_indices[np.argsort(adjusted_scores[top_indices])[::-1]]
-            
-            # Apply offset and limit to top_k
-            result_indices = top_indices[offset:offset + top_k]
-            
+            substring_hits = self._substring_matches(query_lower, top_k) if query_lower else []
+            # A clean substring query fills page 1 by itself, scored by
+            # len(query) / len(name), without loading the model or encoding.
             results = [
+                (self.food_names[i], len(query_lower) / len(self._lower_names[i]))
+                for i in substring_hits[offset:]
+            ]
+            if offset == 0 and results:
+                return results
+
+            # Page 1 (offsets below top_k) held only the substring hits, so the
+            # ranking of the other foods starts at offset top_k.
+            if substring_hits:
+                start, stop = max(offset - top_k, 0), offset
+            else:
+                start, stop = offset, offset + top_k
+            available = len(self.food_names) - len(substring_hits)
+
+            cached = self._last_ranking
+            if cached is not None and cached[0] == (query_lower, top_k):
+                # "Next 5" for the same query: slice the ranking from the first page.
+                _, ranking, adjusted_scores = cached
+            else:
+                self._ensure_embeddings()
+                adjusted_scores = self._rerank_scores(
+                    self._encode_query(query_lower), core_tokens, preferred_tokens
+                )
+                if substring_hits:
+                    # The hits already filled page 1; push them below every other food.
+                    adjusted_scores[substring_hits] = -np.inf
+                ranking = np.empty(0, dtype=np.intp)
+            if len(ranking) < min(stop, available):
+                # Rank only as deep as this page needs (doubling, so paging on
+                # costs O(log pages) partitions).
+                depth = min(max(stop, 2 * len(ranking)), available)
+                ranking = self._top_ranked(adjusted_scores, depth)
+                self._last_ranking = ((query_lower, top_k), ranking, adjusted_scores)
+
+            result_indices = ranking[start:stop]
+            results.extend(
                 (self.food_names[i], float(adjusted_scores[i]))
                 for i in result_indices
-            ]
-            
+            )
+
             return results
         else:
             # Fallback: token-based matching (same core/preferred idea).
             CORE_SCORE_WEIGHT = 1.5
             PREFERRED_SCORE_WEIGHT = 0.5
 
+            if core_len > 0:
+                # Only foods sharing a core token can match; visit them in corpus order.
+                candidate_set: Set[int] = set()
+                for token in core_tokens:
+                    candidate_set.update(self._token_postings.get(token, ()))
+                candidates = sorted(candidate_set)
+            else:
+                candidates = range(len(self.food_names))
+
             matches: List[Tuple[str, float]] = []
-            for food, token_set in zip(self.food_names, self._food_token_sets):
+            for i in candidates:
+                food, token_set = self.food_names[i], self._food_token_sets[i]
                 if core_len > 0:
                     core_hit_count = len(core_tokens.intersection(token_set))
                     if core_hit_count == 0:
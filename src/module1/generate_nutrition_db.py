@@ -5,8 +5,34 @@ Each entry has a unique name. Variations include distinct types and preparations
 Based on USDA FoodData Central and Glycemic Index Foundation data.
 """
 
+import argparse
+import bisect
 import csv
-import random
+import hashlib
+import itertools
+import os
+import shutil
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+# CSV column order; generated rows are tuples in this order.
+FIELDNAMES = [
+    "name",
+    "glycemic_index",
+    "carbohydrates",
+    "fiber",
+    "protein",
+    "fat",
+    "processing_level",
+    "serving_size_grams",
+]
+# One generated food; a lightweight tuple that csv.writer takes as-is.
+FoodRow = namedtuple("FoodRow", FIELDNAMES)
+
+# Continuous nutrient columns sampled uniformly from each template's (low, high).
+_MACRO_KEYS = ("carbs", "fiber", "protein", "fat")
 
 # Preparation methods by category (significant variation per entry)
 GRAIN_PREPS = ["cooked", "steamed", "boiled", "pilaf"]
@@ -19,6 +45,8 @@ PROTEIN_PREPS = ["grilled", "baked", "roasted", "poached", "pan-seared", "braise
 LEGUME_PREPS = ["cooked", "canned", "refried"]
 NUT_PREPS = ["raw", "roasted", "salted", "unsalted"]
 DEFAULT_PREPS = ["raw"]
+# Preparations left out of the generated food name.
+_UNNAMED_PREPS = frozenset(("raw", "cold", "room temperature"))
 
 # Food templates: base + variations. Each (variation, base) is a distinct food.
 # Optional "preparations" list adds unique entries per prep (significant difference).
@@ -343,98 +371,176 @@ FOOD_TEMPLATES = [
 ]
 
 
-def generate_food_entry(template, variation, preparation):
-    """Generate a single food entry. Name is unique: 'variation base preparation'."""
-    # Build unique name: "variation base preparation"
-    base = template["base"]
-    if preparation and preparation != "raw" and preparation not in ("cold", "room temperature"):
-        name = f"{variation} {base} {preparation}"
-    else:
-        name = f"{variation} {base}"
+def _intern_template_strings():
+    """Intern the fixed template vocabulary so rows share one object per string."""
+    for template in FOOD_TEMPLATES:
+        template["base"] = sys.intern(template["base"])
+        template["variations"] = [sys.intern(v) for v in template["variations"]]
+        if "preparations" in template:
+            template["preparations"] = [sys.intern(p) for p in template["preparations"]]
+        processing = template["processing"]
+        if isinstance(processing, list):
+            template["processing"] = [sys.intern(p) for p in processing]
+        else:
+            template["processing"] = sys.intern(processing)
+
+
+_intern_template_strings()
+
+# Numeric template bounds as struct-of-arrays, indexed by template position in
+# FOOD_TEMPLATES, so sampling reads contiguous rows instead of nested dicts.
+_GI_BOUNDS = np.array([template["gi_range"] for template in FOOD_TEMPLATES], dtype=np.int64)
+_MACRO_LOW = np.array(
+    [[template[key][0] for key in _MACRO_KEYS] for template in FOOD_TEMPLATES], dtype=np.float64
+)
+_MACRO_HIGH = np.array(
+    [[template[key][1] for key in _MACRO_KEYS] for template in FOOD_TEMPLATES], dtype=np.float64
+)
+# Every template's serving is an integer gram amount.
+_SERVING_GRAMS = np.array([template["serving"] for template in FOOD_TEMPLATES], dtype=np.int64)
+
+
+def food_name(base, variation, preparation):
+    """Build the unique name 'variation base preparation' (raw/cold preps are omitted)."""
+    if preparation and preparation not in _UNNAMED_PREPS:
+        return " ".join((variation, base, preparation))
+    return " ".join((variation, base))
+
+
+def _combo_starts():
+    """Index of the first combo of each template (plus the total).
+
+    Combos are numbered template by template, then variation by preparation.
+    """
+    sizes = [
+        len(template["variations"]) * len(template.get("preparations", DEFAULT_PREPS))
+        for template in FOOD_TEMPLATES
+    ]
+    return list(itertools.accumulate(sizes, initial=0))
+
+
+def decode_combo(index, starts):
+    """Map a combo index (as numbered by _combo_starts) to (template_id, variation, preparation)."""
+    tid = bisect.bisect_right(starts, index) - 1
+    template = FOOD_TEMPLATES[tid]
+    preps = template.get("preparations", DEFAULT_PREPS)
+    variation_i, prep_i = divmod(index - starts[tid], len(preps))
+    return tid, template["variations"][variation_i], preps[prep_i]
+
+
+def sample_template_values(tid, count, rng):
+    """Draw `count` rows of numeric columns (gi .. serving) for template `tid` at once."""
+    gi_low, gi_high = _GI_BOUNDS[tid]
+    gi = rng.integers(gi_low, gi_high, size=count, endpoint=True).tolist()
+    # carbs, fiber, protein, fat in a single (count, 4) draw, rounded in bulk.
+    macros = np.round(
+        rng.uniform(_MACRO_LOW[tid], _MACRO_HIGH[tid], size=(count, len(_MACRO_KEYS))), 1
+    ).tolist()
 
-    if isinstance(template["processing"], list):
-        processing = random.choice(template["processing"])
+    options = FOOD_TEMPLATES[tid]["processing"]
+    if isinstance(options, list):
+        # Draw indices and pick from the (interned) option list, rather than
+        # rng.choice, which would round-trip every value through a NumPy str array.
+        processing = [options[i] for i in rng.integers(0, len(options), size=count).tolist()]
     else:
-        processing = template["processing"]
+        processing = [options] * count
 
-    gi = random.randint(template["gi_range"][0], template["gi_range"][1])
-    carbs = round(random.uniform(template["carbs"][0], template["carbs"][1]), 1)
-    fiber = round(random.uniform(template["fiber"][0], template["fiber"][1]), 1)
-    protein = round(random.uniform(template["protein"][0], template["protein"][1]), 1)
-    fat = round(random.uniform(template["fat"][0], template["fat"][1]), 1)
-
-    serving = template["serving"]
-    if isinstance(serving, int):
-        serving = max(1, int(serving * random.uniform(0.9, 1.1)))
-
-    return {
-        "name": name,
-        "glycemic_index": gi,
-        "carbohydrates": carbs,
-        "fiber": fiber,
-        "protein": protein,
-        "fat": fat,
-        "processing_level": processing,
-        "serving_size_grams": serving,
-    }
+    servings = np.maximum(1, (_SERVING_GRAMS[tid] * rng.uniform(0.9, 1.1, count)).astype(int)).tolist()
 
+    return ((g, *m, p, sv) for g, m, p, sv in zip(gi, macros, processing, servings))
 
-def build_unique_combos():
-    """Build all unique (template, variation, preparation) combinations."""
-    combos = []
-    for template in FOOD_TEMPLATES:
-        preps = template.get("preparations", DEFAULT_PREPS)
-        for variation in template["variations"]:
-            for preparation in preps:
-                combos.append((template, variation, preparation))
-    return combos
-
-
-def generate_database(num_entries=2000):
-    """Generate nutrition database with unique entries only."""
-    combos = build_unique_combos()
-    # If we have more combos than requested, sample without replacement
-    if len(combos) >= num_entries:
-        combos = random.sample(combos, num_entries)
-    # If we have fewer, we use all and report (shouldn't happen with current templates)
-
-    foods = []
+
+def generate_database(num_entries=2000, seed=None):
+    """Yield unique FoodRow entries in random order.
+
+    All randomness comes from one numpy.random.Generator (PCG64); pass `seed`
+    for a reproducible database. Seeding the stdlib `random` module has no
+    effect here.
+    """
+    rng = np.random.default_rng(seed)
+    # Sample combo indices and decode only those, instead of materializing every
+    # (template, variation, preparation) tuple. If we have more combos than
+    # requested, sample without replacement; if fewer, we use all (shouldn't
+    # happen with current templates).
+    starts = _combo_starts()
+    total = starts[-1]
+    order = rng.choice(total, size=min(num_entries, total), replace=False)
+    combos = [decode_combo(index, starts) for index in order.tolist()]
+
+    # Numbers are drawn per template in one vectorized call per column; rows are
+    # then emitted in the (already random) combo order, so nothing but the
+    # numeric columns is held in memory.
+    tids = [tid for tid, _, _ in combos]
+    counts = np.bincount(tids, minlength=len(FOOD_TEMPLATES))
+    values = {
+        tid: sample_template_values(tid, count, rng)
+        for tid, count in enumerate(counts.tolist())
+        if count
+    }
+
+    # Hot loop: template fields and bound methods are hoisted into locals.
+    bases = [template["base"] for template in FOOD_TEMPLATES]
+    make_name = food_name
     seen_names = set()
-    for template, variation, preparation in combos:
-        entry = generate_food_entry(template, variation, preparation)
+    remember = seen_names.add
+    for tid, variation, preparation in combos:
+        name = make_name(bases[tid], variation, preparation)
         # Ensure name is unique (safety check)
-        name = entry["name"]
         if name in seen_names:
             name = f"{name} ({len(seen_names)})"
-            entry["name"] = name
-        seen_names.add(entry["name"])
-        foods.append(entry)
-
-    random.shuffle(foods)
-    return foods
+        remember(name)
+        yield FoodRow(name, *next(values[tid]))
 
 
 def write_csv(foods, filename="nutrition_data.csv"):
-    """Write foods to CSV file."""
-    fieldnames = [
-        "name",
-        "glycemic_index",
-        "carbohydrates",
-        "fiber",
-        "protein",
-        "fat",
-        "processing_level",
-        "serving_size_grams",
-    ]
-    with open(filename, "w", newline="") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(foods)
-    print(f"Generated {len(foods)} unique food entries in {filename}")
+    """Write food rows (FoodRow or any FIELDNAMES-ordered tuples) to a CSV file."""
+    count = 0
+    # 1 MiB buffer: the whole ~2000-row file goes out in a handful of writes.
+    with open(filename, "w", newline="", encoding="utf-8", buffering=1 << 20) as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(FIELDNAMES)
+        for row in foods:
+            writer.writerow(row)
+            count += 1
+    print(f"Generated {count} unique food entries in {filename}")
+
+
+def template_hash():
+    """Short, stable hash of FOOD_TEMPLATES (changes whenever a template changes)."""
+    return hashlib.blake2b(repr(FOOD_TEMPLATES).encode("utf-8"), digest_size=6).hexdigest()
+
+
+def cached_database_path(cache_dir, num_entries, seed):
+    """Cache file for a seeded database: nutrition_<entries>_<seed>_<template hash>.csv."""
+    return os.path.join(cache_dir, f"nutrition_{num_entries}_{seed}_{template_hash()}.csv")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=(__doc__ or "").strip().partition("\n")[0])
+    parser.add_argument("num_entries", nargs="?", type=int, default=2000,
+                        help="number of unique foods to generate (default: 2000)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="RNG seed; the same seed reproduces the same database (default: 0)")
+    parser.add_argument("--output", default="nutrition_data.csv",
+                        help="CSV file to write (default: nutrition_data.csv)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="reuse/store seeded databases here, keyed by entries, seed and templates")
+    args = parser.parse_args(argv)
+
+    if args.cache_dir is None:
+        write_csv(generate_database(args.num_entries, seed=args.seed), args.output)
+        return
+
+    cached = cached_database_path(args.cache_dir, args.num_entries, args.seed)
+    if os.path.exists(cached):
+        print(f"Using cached database {cached}")
+    else:
+        os.makedirs(args.cache_dir, exist_ok=True)
+        write_csv(generate_database(args.num_entries, seed=args.seed), cached)
+    if os.path.abspath(cached) != os.path.abspath(args.output):
+        shutil.copyfile(cached, args.output)
+        print(f"Wrote {args.output}")
 
 
 if __name__ == "__main__":
-    import sys
-    num_entries = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
-    foods = generate_database(num_entries)
-    write_csv(foods)
+    main()
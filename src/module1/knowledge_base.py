@@ -2,7 +2,8 @@
 Nutrition Knowledge Base: loads nutrition data from CSV and provides feature lookup.
 
 Knowledge representation: CSV file.
-In-memory knowledge base: dict mapping food name -> nutrition data.
+In-memory knowledge base: dict mapping food name -> nutrition data, plus parallel
+NumPy columns (struct-of-arrays) for batch feature lookups.
 
 Created 1/30/2026
 Authors: Jia Lin and Della Avent
@@ -10,23 +11,106 @@ Last Updated: 2/3/2026
 """
 
 import csv
-from typing import Dict, List
+import functools
+import os
+import re
+import sys
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple, TypeVar, Union
+
+import numpy as np
 
 # Numeric columns in CSV that should be converted to float during loading
 _FLOAT_KEYS = ("glycemic_index", "carbohydrates", "fiber", "protein", "fat", "serving_size_grams")
 
+# Column order of get_features_matrix().
+FEATURE_MATRIX_COLUMNS = ("glycemic_index", "glycemic_load", "carbohydrates", "fiber", "protein", "fat")
+
+# Parsed CSV data keyed by (absolute path, mtime_ns, size), shared across instances.
+_LOAD_CACHE: Dict[Tuple[str, int, int], Dict] = {}
+
+# Fields each lookup requires (MissingDataError if any are None).
+_FEATURE_KEYS = (
+    "glycemic_index", "carbohydrates", "fiber", "protein", "fat",
+    "serving_size_grams", "processing_level",
+)
+_GI_KEYS = ("glycemic_index",)
+_GL_KEYS = ("glycemic_index", "carbohydrates", "serving_size_grams")
+
+# Default serving size; every stored nutrient value is per 100g.
+_DEFAULT_SERVING = "100g"
+
+# Common serving formats in one pass: "<number>g", "<number> g", "<number> serving(s)".
+# Same grammar as the general parser below: "g" may follow the number directly, but
+# "serving(s)" must be a separate word ("1.5servings" is rejected).
+_SERVING_RE = re.compile(
+    r"\s*([-+]?(?:\d+(?:\.\d*)?|\.\d+))(?:\s*(g)|\s+(servings?))\s*", re.IGNORECASE
+)
+# Unit -> (per_serving, error message for a negative amount).
+_SERVING_UNITS = {
+    "g": (False, "Grams cannot be negative"),
+    "serving": (True, "Serving count cannot be negative"),
+    "servings": (True, "Serving count cannot be negative"),
+}
+
+# Scalar or column argument of _calculate_glycemic_load (the result has the same kind).
+_GLValue = TypeVar("_GLValue", float, np.ndarray)
+
+# Max number of (food_name, serving_size) feature results memoized per knowledge base.
+_FEATURE_CACHE_SIZE = 4096
+# Max number of distinct serving strings whose parse is memoized.
+_SERVING_CACHE_SIZE = 256
+
 # Raised when a requested food is not in the knowledge base.
+# The default message is only formatted if the error is actually displayed, so
+# bulk probes that catch and discard misses don't pay for it.
 class FoodNotFoundError(Exception):
-    def __init__(self, message: str, food_name: str):
-        super().__init__(message)
+    def __init__(self, message: Optional[str] = None, food_name: str = ""):
+        super().__init__(*(() if message is None else (message,)))
         self.food_name = food_name
-        
+
+    def __str__(self) -> str:
+        if self.args:
+            return str(self.args[0])
+        return f"Food {self.food_name} not found in the knowledge base."
+
 
 # Raised when a requested food has missing data.
 class MissingDataError(Exception):
-    def __init__(self, message: str, food_name: str):
-        super().__init__(message)
+    def __init__(
+        self, message: Optional[str] = None, food_name: str = "", missing: Sequence[str] = ()
+    ):
+        super().__init__(*(() if message is None else (message,)))
         self.food_name = food_name
+        self.missing = tuple(missing)
+
+    def __str__(self) -> str:
+        if self.args:
+            return str(self.args[0])
+        return f"Missing data for {self.food_name}: {', '.join(self.missing)}"
+
+
+def _parse_text(raw: str) -> Optional[str]:
+    # CSV cell -> stripped string, or None if blank.
+    return raw.strip() or None
+
+
+def _parse_float(raw: str) -> Optional[float]:
+    # CSV cell -> float, or None if blank.
+    value = raw.strip()
+    return float(value) if value else None
+
+
+class NutritionRecord(NamedTuple):
+    """Nutrition features of one food at one serving size (see get_nutrition_features)."""
+    glycemic_index: float
+    glycemic_load: float
+    carbohydrates: float
+    fiber: float
+    protein: float
+    fat: float
+    processing_level: str
+    serving_size_grams: float
 
 
 class NutritionKnowledgeBase:
@@ -44,7 +128,15 @@ class NutritionKnowledgeBase:
             FileNotFoundError: If CSV file cannot be found.
             ValueError: If CSV is malformed or missing required columns.
         """
-        self.data = self._load_csv(csv_path)
+        self.data = self._load_csv_cached(csv_path)
+        # Column (SoA) view for batch lookups; built on first use by _ensure_columns,
+        # so single-food callers never pay for it.
+        self._columns: Optional[Dict[str, np.ndarray]] = None
+        # Per-instance memo of feature lookups: pure in (food_name, serving_size) for
+        # the loaded data. Failed lookups raise and are not cached.
+        self._cached_features = functools.lru_cache(maxsize=_FEATURE_CACHE_SIZE)(
+            self._compute_nutrition_features
+        )
 
     def get_nutrition_features(self, food_name: str, serving_size: str = "100g") -> dict:
         """Return structured nutrition features for a food at the given serving size.
@@ -63,23 +155,36 @@ class NutritionKnowledgeBase:
             MissingDataError: If required nutrition data missing.
             ValueError: If serving_size format invalid or negative.
         """
-        # Normalize the food name.
-        normalized_name = self._normalize_name(food_name)
-        # Look up normalized name in self.data; if missing, raise FoodNotFoundError.
-        if normalized_name not in self.data:
-            raise FoodNotFoundError(f"Food {food_name} not found in the knowledge base.", food_name)
-        # Get this food's nutrition row from the dict.
-        food_data = self.data[normalized_name]
-        # Require all fields needed for features; raise MissingDataError if any are missing.
-        required_keys = (
-            "glycemic_index", "carbohydrates", "fiber", "protein", "fat",
-            "serving_size_grams", "processing_level",
-        )
-        # there shouldn't be any missing keys, but just in case, check for them
-        missing = [k for k in required_keys if food_data.get(k) is None]
-        if missing:
-            raise MissingDataError(
-                f"Missing data for {food_name}: {', '.join(missing)}", food_name
+        # Results are memoized as immutable records; each caller gets its own dict.
+        return self._cached_features(food_name, serving_size)._asdict()
+
+    def get_nutrition_record(self, food_name: str, serving_size: str = "100g") -> NutritionRecord:
+        """Return the same features as get_nutrition_features, as an immutable NutritionRecord.
+        
+        Cheaper than the dict form: repeated lookups return the memoized record
+        itself. Fields are read as attributes (record.glycemic_load).
+        
+        Raises:
+            FoodNotFoundError: If food name not found.
+            MissingDataError: If required nutrition data missing.
+            ValueError: If serving_size format invalid or negative.
+        """
+        return self._cached_features(food_name, serving_size)
+
+    def _compute_nutrition_features(self, food_name: str, serving_size: str) -> NutritionRecord:
+        # Look up the food and require all fields needed for features.
+        food_data = self._get_food_data(food_name, _FEATURE_KEYS)
+        if serving_size == _DEFAULT_SERVING:
+            # Stored values are already per 100g: no parsing and no scaling (x * 1.0 == x).
+            return NutritionRecord(
+                food_data["glycemic_index"],
+                self._calculate_glycemic_load(food_data["glycemic_index"], food_data["carbohydrates"]),
+                food_data["carbohydrates"],
+                food_data["fiber"],
+                food_data["protein"],
+                food_data["fat"],
+                food_data["processing_level"],
+                100.0,
             )
         # Convert serving_size to grams using _convert_serving_size.
         serving_grams = self._convert_serving_size(serving_size, food_data["serving_size_grams"])
@@ -91,21 +196,167 @@ class NutritionKnowledgeBase:
         scaled_fat = food_data["fat"] * scale
         # Compute glycemic load for this serving with _calculate_glycemic_load.
         glycemic_load = self._calculate_glycemic_load(food_data["glycemic_index"], scaled_carbs)
-        # Build and return one dict with GI, GL, macronutrients, processing_level, serving info.
-        return {"glycemic_index": food_data["glycemic_index"], 
-                "glycemic_load": glycemic_load, 
-                "carbohydrates": scaled_carbs, 
-                "fiber": scaled_fiber, 
-                "protein": scaled_protein, 
-                "fat": scaled_fat, 
-                "processing_level": food_data["processing_level"], 
+        # Build and return one record with GI, GL, macronutrients, processing_level, serving info.
+        return NutritionRecord(food_data["glycemic_index"],
+                               glycemic_load,
+                               scaled_carbs,
+                               scaled_fiber,
+                               scaled_protein,
+                               scaled_fat,
+                               food_data["processing_level"],
+                               serving_grams)
+
+    def get_glycemic_index(self, food_name: str) -> float:
+        """Return only the glycemic index of a food (no serving scaling).
+        
+        Raises:
+            FoodNotFoundError: If food name not found.
+            MissingDataError: If the food has no glycemic index.
+        """
+        return self._get_food_data(food_name, _GI_KEYS)["glycemic_index"]
+
+    def get_glycemic_load(self, food_name: str, serving_size: str = "100g") -> float:
+        """Return only the glycemic load of a food at the given serving size.
+        
+        Same value as get_nutrition_features(...)["glycemic_load"], without scaling
+        the other nutrients or building the features dict.
+        
+        Raises:
+            FoodNotFoundError: If food name not found.
+            MissingDataError: If GI, carbohydrates or serving size data is missing.
+            ValueError: If serving_size format invalid or negative.
+        """
+        food_data = self._get_food_data(food_name, _GL_KEYS)
+        serving_grams = self._convert_serving_size(serving_size, food_data["serving_size_grams"])
+        scaled_carbs = food_data["carbohydrates"] * (serving_grams / 100)
+        return self._calculate_glycemic_load(food_data["glycemic_index"], scaled_carbs)
+
+    def get_nutrition_features_batch(
+        self,
+        food_names: Sequence[str],
+        serving_sizes: Union[str, Sequence[str]] = "100g",
+    ) -> Dict:
+        """Return nutrition features for many foods at once, as parallel arrays.
+        
+        Args:
+            food_names: Food names (case-insensitive, whitespace-tolerant).
+            serving_sizes: One serving size string applied to every food, or one
+                           string per food. Same formats as get_nutrition_features.
+        
+        Returns:
+            Dict with the same keys as get_nutrition_features. Numeric values are
+            float64 arrays aligned with food_names; processing_level is a list.
+        
+        Raises:
+            FoodNotFoundError: If any food name is not found.
+            MissingDataError: If required nutrition data is missing for any food.
+            ValueError: If any serving_size format is invalid or negative, or the
+                        number of serving sizes does not match the number of foods.
+        """
+        # Bind hot lookups once; the per-food loops below only touch locals.
+        all_columns = self._ensure_columns()
+        row_index_get = self._row_index.get
+        resolve = self._resolve_name
+        rows = np.empty(len(food_names), dtype=np.intp)
+        for i, food_name in enumerate(food_names):
+            row = row_index_get(resolve(food_name))
+            if row is None:
+                raise FoodNotFoundError(food_name=food_name)
+            rows[i] = row
+
+        columns = {k: column[rows] for k, column in all_columns.items()}
+        codes = self._processing_codes[rows]
+        # One NaN scan per column; only foods that fail it are revisited for the error.
+        incomplete = np.zeros(len(rows), dtype=bool)
+        for k in _FLOAT_KEYS:
+            incomplete |= np.isnan(columns[k])
+        incomplete |= codes == 0
+        if incomplete.any():
+            i = int(np.argmax(incomplete))
+            missing = [k for k in _FLOAT_KEYS if np.isnan(columns[k][i])]
+            if codes[i] == 0:
+                missing.append("processing_level")
+            raise MissingDataError(food_name=food_names[i], missing=missing)
+
+        base_grams = columns["serving_size_grams"]
+        if isinstance(serving_sizes, str):
+            amount, per_serving = self._parse_serving_size(serving_sizes)
+            serving_grams = amount * base_grams if per_serving else np.full(len(rows), amount)
+        else:
+            if len(serving_sizes) != len(food_names):
+                raise ValueError("serving_sizes must be a single string or one per food")
+            convert = self._convert_serving_size
+            serving_grams = np.array(
+                [convert(s, b) for s, b in zip(serving_sizes, base_grams.tolist())],
+                dtype=np.float64,
+            )
+
+        # One vectorized scale per nutrient: per_100g * (serving_grams / 100).
+        scale = serving_grams / 100
+        scaled_carbs = columns["carbohydrates"] * scale
+        return {"glycemic_index": columns["glycemic_index"],
+                "glycemic_load": self._calculate_glycemic_load(columns["glycemic_index"], scaled_carbs),
+                "carbohydrates": scaled_carbs,
+                "fiber": columns["fiber"] * scale,
+                "protein": columns["protein"] * scale,
+                "fat": columns["fat"] * scale,
+                "processing_level": self._processing_vocab[codes].tolist(),
                 "serving_size_grams": serving_grams}
 
+    def get_features_matrix(self, serving_grams: float = 100.0) -> np.ndarray:
+        """Return every food's numeric features at one serving weight, as a 2D array.
+        
+        Args:
+            serving_grams: Serving weight in grams applied to every food.
+        
+        Returns:
+            float64 array of shape (len(self), len(FEATURE_MATRIX_COLUMNS)) with rows in
+            list_all_foods() order and columns in FEATURE_MATRIX_COLUMNS order
+            (glycemic_index, glycemic_load, carbohydrates, fiber, protein, fat).
+            Missing values are NaN.
+        
+        Raises:
+            ValueError: If serving_grams is negative.
+        """
+        if serving_grams < 0:
+            raise ValueError("Grams cannot be negative")
+        columns = self._ensure_columns()
+        matrix = np.empty((len(self._processing_codes), len(FEATURE_MATRIX_COLUMNS)), dtype=np.float64)
+        scale = serving_grams / 100
+        matrix[:, 0] = columns["glycemic_index"]
+        # Scale the macro columns straight into the output buffer.
+        for j, key in enumerate(("carbohydrates", "fiber", "protein", "fat"), start=2):
+            np.multiply(columns[key], scale, out=matrix[:, j])
+        matrix[:, 1] = self._calculate_glycemic_load(matrix[:, 0], matrix[:, 2])
+        return matrix
+
+    def get_complete_mask(self) -> np.ndarray:
+        """Return which foods have every value get_nutrition_features requires.
+        
+        Returns:
+            bool array of length len(self), in list_all_foods() order; False where
+            get_nutrition_features would raise MissingDataError.
+        """
+        columns = self._ensure_columns()
+        complete = self._processing_codes != 0
+        for k in _FLOAT_KEYS:
+            complete &= ~np.isnan(columns[k])
+        return complete
+
+    def has_food(self, food_name: str) -> bool:
+        """Return True if the food (case-insensitive, whitespace-tolerant) is in the knowledge base."""
+        return self._resolve_name(food_name) in self.data
+
+    def __len__(self) -> int:
+        """Number of foods in the knowledge base."""
+        return len(self.data)
+
     def list_all_foods(self) -> List[str]:
         """Return list of all food names in the knowledge base.
         
         Returns:
             List of normalized food name strings (lowercase, whitespace-normalized).
+            Passing these back to the lookup methods skips name normalization.
         """
         return list(self.data.keys())
 
@@ -119,29 +370,138 @@ class NutritionKnowledgeBase:
         """
         return self.data.copy()
 
+    def view_all_foods(self) -> Mapping[str, Dict]:
+        """Return a read-only live view of all food data (no copy).
+        
+        Prefer this over get_all_foods() when only iterating or reading: it costs O(1)
+        instead of copying every entry.
+        
+        Returns:
+            Read-only mapping of normalized food names to nutrition data dicts (same
+            contents as get_all_foods()). The per-food dicts are shared with the
+            knowledge base and must not be modified.
+        """
+        return MappingProxyType(self.data)
+
+    def _load_csv_cached(self, filepath: str) -> Dict:
+        # Parse each CSV once per process; a changed file (mtime/size) is re-read.
+        # Instances built from the same file share the parsed dict.
+        stat = os.stat(filepath)
+        key = (os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size)
+        data = _LOAD_CACHE.get(key)
+        if data is None:
+            data = self._load_csv(filepath)
+            _LOAD_CACHE[key] = data
+        return data
+
     def _load_csv(self, filepath: str) -> Dict:
         nutrition_dict: Dict = {}
 
-        with open(filepath, "r", encoding="utf-8") as file:
-            for row in csv.DictReader(file):
-                normalized_name = self._normalize_name((row.get("name") or "").strip())
-                nutrition_row = {k: (v or "").strip() or None for k, v in row.items()}
-                for k in _FLOAT_KEYS:
-                    v = nutrition_row.get(k)
-                    nutrition_row[k] = float(v) if v else None
-                nutrition_dict[normalized_name] = nutrition_row
+        # One large buffer: the whole file is read in a few syscalls, not one per 8 KiB.
+        with open(filepath, "r", newline="", encoding="utf-8", buffering=1 << 20) as file:
+            reader = csv.reader(file)
+            header = next(reader, None)
+            if header is None:
+                return nutrition_dict
+            # Interned header keys are the same objects as the key literals used in
+            # lookups (row["glycemic_index"]), so those probes match by identity.
+            header = [sys.intern(k) for k in header]
+            # One converter per column, chosen once from the header; each row is then
+            # stripped, typed and keyed in a single pass.
+            width = len(header)
+            converters = [_parse_float if k in _FLOAT_KEYS else _parse_text for k in header]
+            absent_float_keys = [k for k in _FLOAT_KEYS if k not in header]
+            for row in reader:
+                if not row:
+                    continue
+                if len(row) < width:
+                    row.extend([""] * (width - len(row)))
+                nutrition_row = {k: convert(v) for k, convert, v in zip(header, converters, row)}
+                for k in absent_float_keys:
+                    nutrition_row[k] = None
+                # The name column always goes through _parse_text; str() just makes that explicit.
+                name = nutrition_row.get("name")
+                name_text = "" if name is None else str(name)
+                nutrition_dict[sys.intern(self._normalize_name(name_text))] = nutrition_row
         return nutrition_dict
 
+    def _ensure_columns(self) -> Dict[str, np.ndarray]:
+        # Returns the float columns (built on first call) as a non-Optional local.
+        if self._columns is None:
+            return self._build_columns()
+        return self._columns
+
+    def _build_columns(self) -> Dict[str, np.ndarray]:
+        # Struct-of-arrays view of self.data: row index per name, one float64 column
+        # per numeric key (NaN where missing) and a small-int processing_level code
+        # per row, decoded through self._processing_vocab (code 0 means missing).
+        rows = list(self.data.values())
+        self._row_index: Dict[str, int] = {name: i for i, name in enumerate(self.data)}
+        columns = {
+            k: np.array([np.nan if row.get(k) is None else row[k] for row in rows], dtype=np.float64)
+            for k in _FLOAT_KEYS
+        }
+        levels = [row.get("processing_level") for row in rows]
+        vocab = [None] + sorted({level for level in levels if level is not None})
+        code_of = {level: code for code, level in enumerate(vocab)}
+        self._processing_vocab = np.array(vocab, dtype=object)
+        self._processing_codes = np.array(
+            [code_of[level] for level in levels], dtype=np.min_scalar_type(len(vocab))
+        )
+        # Set last: a non-None self._columns means every column attribute exists.
+        self._columns = columns
+        return columns
+
+    def _get_food_data(self, food_name: str, required_keys: Tuple[str, ...]) -> Dict:
+        # Look up normalized name in self.data (one probe); if missing, raise FoodNotFoundError.
+        food_data = self.data.get(self._resolve_name(food_name))
+        if food_data is None:
+            raise FoodNotFoundError(food_name=food_name)
+        # there shouldn't be any missing keys, but just in case, check for them
+        missing = [k for k in required_keys if food_data.get(k) is None]
+        if missing:
+            raise MissingDataError(food_name=food_name, missing=missing)
+        return food_data
+
+    def _resolve_name(self, food_name: str) -> str:
+        # Exact keys are already normalized (normalization is idempotent), so names
+        # taken from list_all_foods() skip the lower/split/join work.
+        if food_name in self.data:
+            return food_name
+        return self._normalize_name(food_name)
+
     def _normalize_name(self, name: str) -> str:
         if not name:
             return ""
-        # lowercase, strip, collapse repeated spaces
-        return " ".join(name.lower().strip().split())
+        # lowercase, collapse repeated whitespace (split() also drops the ends)
+        return " ".join(name.lower().split())
 
-    def _calculate_glycemic_load(self, gi: float, carbs_per_serving: float) -> float:
+    def _calculate_glycemic_load(self, gi: _GLValue, carbs_per_serving: _GLValue) -> _GLValue:
+        # Elementwise: scalars for one food, whole columns in the batch and matrix paths.
         return (gi * carbs_per_serving) / 100
 
     def _convert_serving_size(self, serving_str: str, base_grams: float) -> float:
+        amount, per_serving = self._parse_serving_size(serving_str)
+        return amount * base_grams if per_serving else amount
+
+    @staticmethod
+    @functools.lru_cache(maxsize=_SERVING_CACHE_SIZE)
+    def _parse_serving_size(serving_str: str) -> Tuple[float, bool]:
+        # Returns (amount, per_serving): grams when per_serving is False, otherwise a
+        # number of servings to multiply by the food's serving_size_grams.
+        # Memoized across instances: callers tend to repeat a handful of strings.
+        if serving_str == _DEFAULT_SERVING:
+            return 100.0, False
+        match = _SERVING_RE.fullmatch(serving_str)
+        if match is not None:
+            amount = float(match.group(1))
+            unit = match.group(2) or match.group(3)
+            per_serving, negative_message = _SERVING_UNITS[unit.lower()]
+            if amount < 0:
+                raise ValueError(negative_message)
+            return amount, per_serving
+
+        # Anything else (errors, "1 serving size", exponents, ...) takes the general path.
         serving_lower = serving_str.strip().lower()
         if not serving_lower:
             raise ValueError("Serving size string is empty")
@@ -158,7 +518,7 @@ class NutritionKnowledgeBase:
                 raise ValueError(f"Invalid serving format: {serving_str!r}")
             if count < 0:
                 raise ValueError("Serving count cannot be negative")
-            return count * base_grams
+            return count, True
 
         # "100g" or "200 g" -> grams
         if serving_lower.endswith("g"):
@@ -169,6 +529,6 @@ class NutritionKnowledgeBase:
                 raise ValueError(f"Invalid grams format: {serving_str!r}")
             if grams < 0:
                 raise ValueError("Grams cannot be negative")
-            return grams
+            return grams, False
 
         raise ValueError(f"Unrecognized serving size format: {serving_str!r}")
@@ -8,10 +8,21 @@ Created 2/3/2026
 Authors: Jia Lin and Della Avent
 """
 
-from typing import Dict, Optional, cast
+import functools
+from typing import Dict, Optional, Tuple, cast
 
-from src.module1.knowledge_base import NutritionKnowledgeBase, FoodNotFoundError, MissingDataError
-from src.module2.safety_rules import evaluate_propositions, NutritionFeatures
+import numpy as np
+
+from src.module1.knowledge_base import (
+    FEATURE_MATRIX_COLUMNS,
+    NutritionKnowledgeBase,
+    FoodNotFoundError,
+    MissingDataError,
+)
+from src.module2.safety_rules import evaluate_propositions, get_safety_labels_batch, NutritionFeatures
+
+# Max number of (food_name, serving_size) evaluations memoized per engine.
+_EVALUATION_CACHE_SIZE = 4096
 
 
 class FoodSafetyEngine:
@@ -37,6 +48,11 @@ class FoodSafetyEngine:
             raise TypeError("knowledge_base must be a NutritionKnowledgeBase instance.")
         self.knowledge_base = knowledge_base
         self._thresholds = thresholds  # Stored for future use; safety_rules uses module constants for now.
+        # Per-engine memo of (label, explanation); the knowledge base is read-only, so a
+        # repeated query (typically the default "100g") skips lookup and rule evaluation.
+        self._cached_evaluation = functools.lru_cache(maxsize=_EVALUATION_CACHE_SIZE)(
+            self._evaluate
+        )
 
     def evaluate_food(self, food_name: str, serving_size: str = "100g") -> Dict[str, str]:
         """Evaluate safety of a food at the given serving size.
@@ -56,7 +72,35 @@ class FoodSafetyEngine:
             MissingDataError: If required nutrition data missing (from Module 1).
             ValueError: If serving_size format invalid (from Module 1).
         """
+        label, explanation = self._cached_evaluation(food_name, serving_size)
+        return {"safety_label": label, "explanation": explanation}
+
+    def _evaluate(self, food_name: str, serving_size: str) -> Tuple[str, str]:
         raw_features = self.knowledge_base.get_nutrition_features(food_name, serving_size)
         features = cast(NutritionFeatures, raw_features)
-        label, explanation = evaluate_propositions(features)
-        return {"safety_label": label, "explanation": explanation}
+        return evaluate_propositions(features)
+
+    def evaluate_all(self, serving_grams: float = 100.0) -> Dict[str, str]:
+        """Safety label of every food in the knowledge base at one serving weight.
+        
+        Same labels as evaluate_food(name, f"{serving_grams}g") for each food, computed
+        for the whole knowledge base with a few array operations.
+        
+        Args:
+            serving_grams: Serving weight in grams applied to every food. Defaults to 100.
+        
+        Returns:
+            Dict mapping normalized food name -> "safe", "caution", or "unsafe", in
+            list_all_foods() order. Foods missing any required nutrition data are
+            omitted (evaluate_food would raise MissingDataError for them).
+        
+        Raises:
+            ValueError: If serving_grams is negative (from Module 1).
+        """
+        matrix = self.knowledge_base.get_features_matrix(serving_grams)
+        gi = matrix[:, FEATURE_MATRIX_COLUMNS.index("glycemic_index")]
+        gl = matrix[:, FEATURE_MATRIX_COLUMNS.index("glycemic_load")]
+        labels = get_safety_labels_batch(gl, gi).tolist()
+        complete = self.knowledge_base.get_complete_mask()
+        names = self.knowledge_base.list_all_foods()
+        return {names[i]: labels[i] for i in np.flatnonzero(complete).tolist()}
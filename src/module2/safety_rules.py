@@ -12,7 +12,9 @@ Created 2/3/2026
 Authors: Jia Lin and Della Avent
 """
 
-from typing import Dict, Tuple, TypedDict
+from typing import Dict, Literal, Optional, Tuple, TypedDict, overload
+
+import numpy as np
 
 
 class NutritionFeatures(TypedDict):
@@ -79,58 +81,128 @@ def get_gi_category(glycemic_index: float) -> str:
     return "unsafe"
 
 
-def _build_explanation(gl: float, gi: float) -> str:
-    """Build a human-readable explanation for the given GL and GI values."""
-    parts = []
-    if gl <= SAFE_GL_THRESHOLD:
-        parts.append(f"Glycemic load {gl:.1f} within safe range (≤{SAFE_GL_THRESHOLD}).")
-    elif gl <= CAUTION_GL_THRESHOLD:
-        parts.append(
-            f"Glycemic load {gl:.1f} exceeds safe threshold ({SAFE_GL_THRESHOLD}); "
-            f"within caution range (≤{CAUTION_GL_THRESHOLD})."
-        )
-    else:
-        parts.append(f"Glycemic load {gl:.1f} exceeds caution threshold ({CAUTION_GL_THRESHOLD}).")
-
-    if gi <= SAFE_GI_THRESHOLD:
-        parts.append(f"Glycemic index {gi:.1f} within safe range (≤{SAFE_GI_THRESHOLD}).")
-    elif gi <= CAUTION_GI_THRESHOLD:
-        parts.append(
-            f"Glycemic index {gi:.1f} exceeds safe threshold ({SAFE_GI_THRESHOLD}); "
-            f"within caution range (≤{CAUTION_GI_THRESHOLD})."
-        )
-    else:
-        parts.append(f"Glycemic index {gi:.1f} exceeds caution threshold ({CAUTION_GI_THRESHOLD}).")
-
-    return " ".join(parts)
-
-
-def evaluate_propositions(features: NutritionFeatures) -> Tuple[str, str]:
+# Category labels in priority order; index 0/1/2 = safe/caution/unsafe.
+_CATEGORY_LABELS = np.array(["safe", "caution", "unsafe"])
+_GL_EDGES = np.array([SAFE_GL_THRESHOLD, CAUTION_GL_THRESHOLD])
+_GI_EDGES = np.array([SAFE_GI_THRESHOLD, CAUTION_GI_THRESHOLD])
+
+
+def _category_codes(values, edges: np.ndarray) -> np.ndarray:
+    # side="left" keeps the thresholds inclusive (value == edge stays in the lower
+    # category), matching the scalar functions; NaN sorts past both edges -> unsafe.
+    return np.searchsorted(edges, np.asarray(values, dtype=np.float64), side="left")
+
+
+def get_gl_category_batch(glycemic_loads) -> np.ndarray:
+    """Vectorized get_gl_category over an array of glycemic loads.
+    
+    Args:
+        glycemic_loads: Array-like of glycemic load values.
+    
+    Returns:
+        Array of "safe"/"caution"/"unsafe" strings, same shape as the input.
+    """
+    return _CATEGORY_LABELS[_category_codes(glycemic_loads, _GL_EDGES)]
+
+
+def get_gi_category_batch(glycemic_indices) -> np.ndarray:
+    """Vectorized get_gi_category over an array of glycemic indices.
+    
+    Args:
+        glycemic_indices: Array-like of glycemic index values.
+    
+    Returns:
+        Array of "safe"/"caution"/"unsafe" strings, same shape as the input.
+    """
+    return _CATEGORY_LABELS[_category_codes(glycemic_indices, _GI_EDGES)]
+
+
+def get_safety_labels_batch(glycemic_loads, glycemic_indices) -> np.ndarray:
+    """Vectorized safety label (worse of the GL and GI categories) for many foods.
+    
+    Args:
+        glycemic_loads: Array-like of glycemic load values.
+        glycemic_indices: Array-like of glycemic index values, same shape.
+    
+    Returns:
+        Array of "safe"/"caution"/"unsafe" strings, as evaluate_propositions would
+        label each (GL, GI) pair.
+    """
+    codes = np.maximum(
+        _category_codes(glycemic_loads, _GL_EDGES), _category_codes(glycemic_indices, _GI_EDGES)
+    )
+    return _CATEGORY_LABELS[codes]
+
+
+# Explanation sentence per category (index 0/1/2 = safe/caution/unsafe), with the
+# thresholds formatted in once; only the value is filled in per call.
+_GL_TEMPLATES = (
+    f"Glycemic load {{:.1f}} within safe range (≤{SAFE_GL_THRESHOLD}).",
+    f"Glycemic load {{:.1f}} exceeds safe threshold ({SAFE_GL_THRESHOLD}); "
+    f"within caution range (≤{CAUTION_GL_THRESHOLD}).",
+    f"Glycemic load {{:.1f}} exceeds caution threshold ({CAUTION_GL_THRESHOLD}).",
+)
+_GI_TEMPLATES = (
+    f"Glycemic index {{:.1f}} within safe range (≤{SAFE_GI_THRESHOLD}).",
+    f"Glycemic index {{:.1f}} exceeds safe threshold ({SAFE_GI_THRESHOLD}); "
+    f"within caution range (≤{CAUTION_GI_THRESHOLD}).",
+    f"Glycemic index {{:.1f}} exceeds caution threshold ({CAUTION_GI_THRESHOLD}).",
+)
+# Plain-str view of _CATEGORY_LABELS for the scalar path.
+_LABELS: Tuple[str, ...] = tuple(_CATEGORY_LABELS.tolist())
+
+
+def _category_index(value: float, safe: float, caution: float) -> int:
+    # 0/1/2 for safe/caution/unsafe; written so NaN (no comparison holds) is unsafe,
+    # as in the if-chains above.
+    return 2 - (value <= caution) - (value <= safe)
+
+
+@overload
+def evaluate_propositions(
+    features: NutritionFeatures, *, return_explanation: Literal[True] = ...
+) -> Tuple[str, str]: ...
+
+
+@overload
+def evaluate_propositions(
+    features: NutritionFeatures, *, return_explanation: Literal[False]
+) -> Tuple[str, None]: ...
+
+
+@overload
+def evaluate_propositions(
+    features: NutritionFeatures, *, return_explanation: bool
+) -> Tuple[str, Optional[str]]: ...
+
+
+def evaluate_propositions(
+    features: NutritionFeatures, *, return_explanation: bool = True
+) -> Tuple[str, Optional[str]]:
     """Evaluate all propositional rules against nutrition features.
     
     Args:
         features: Dict from Module 1 with keys: glycemic_index, glycemic_load,
                  carbohydrates, fiber, protein, fat, processing_level, serving_size_grams.
+        return_explanation: If False, skip building the explanation (callers that
+                 only need the label); it is returned as None.
     
     Returns:
         Tuple of (safety_label, explanation) where:
         - safety_label: "safe", "caution", or "unsafe"
-        - explanation: Human-readable explanation of which rules fired
+        - explanation: Human-readable explanation of which rules fired, or None
+          when return_explanation is False
     
     Note:
         Priority: unsafe > caution > safe (if multiple rules fire, use highest priority).
     """
     gl = features["glycemic_load"]
     gi = features["glycemic_index"]
-    gl_cat = get_gl_category(gl)
-    gi_cat = get_gi_category(gi)
-
-    if gl_cat == "unsafe" or gi_cat == "unsafe":
-        label = "unsafe"
-    elif gl_cat == "caution" or gi_cat == "caution":
-        label = "caution"
-    else:
-        label = "safe"
-
-    explanation = _build_explanation(gl, gi)
+    # Each metric's category indexes both the label priority and its explanation template.
+    gl_idx = _category_index(gl, SAFE_GL_THRESHOLD, CAUTION_GL_THRESHOLD)
+    gi_idx = _category_index(gi, SAFE_GI_THRESHOLD, CAUTION_GI_THRESHOLD)
+    label = _LABELS[max(gl_idx, gi_idx)]
+    if not return_explanation:
+        return (label, None)
+    explanation = _GL_TEMPLATES[gl_idx].format(gl) + " " + _GI_TEMPLATES[gi_idx].format(gi)
     return (label, explanation)
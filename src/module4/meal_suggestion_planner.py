@@ -330,6 +330,8 @@ class MealSuggestionPlanner:
         self.max_edits = max_edits
         self.max_expansions = max_expansions
         self._all_foods = self.knowledge_base.list_all_foods()
+        # category -> foods in list_all_foods() order; built on first swap/add lookup.
+        self._foods_by_category: Optional[Dict[str, List[str]]] = None
         self._original_count: int = 0
         self._start_meal: Tuple[Tuple[str, str], ...] = ()
 
@@ -676,11 +678,7 @@ class MealSuggestionPlanner:
         if src_category == "other":
             return []
 
-        pool = [
-            c
-            for c in self._all_foods
-            if c != food_name and infer_food_category(c) == src_category
-        ]
+        pool = [c for c in self._foods_in_category(src_category) if c != food_name]
 
         # Grain/starch: same coarse category is not enough (rice vs pasta salad).
         if src_category == "grain_starch":
@@ -707,10 +705,12 @@ class MealSuggestionPlanner:
 
     def _add_candidates(self) -> List[str]:
         ranked: List[Tuple[float, str]] = []
-        for food in self._all_foods:
-            category = infer_food_category(food)
-            if category not in {"vegetable", "legume", "protein"}:
-                continue
+        candidates = [
+            food
+            for category in ("vegetable", "legume", "protein")
+            for food in self._foods_in_category(category)
+        ]
+        for food in candidates:
             features = self.knowledge_base.get_nutrition_features(food, "100g")
             gi = float(features["glycemic_index"])
             fiber_g = float(features["fiber"])
@@ -719,13 +719,24 @@ class MealSuggestionPlanner:
         ranked.sort(key=lambda t: (-t[0], t[1]))
         return [name for _, name in ranked[:ADD_CANDIDATE_SLICE]]
 
+    def _foods_in_category(self, category: str) -> List[str]:
+        """Knowledge-base foods whose inferred category is ``category``.
+
+        The whole food list is categorized once per planner, so each swap/add lookup
+        reads one bucket instead of re-running infer_food_category over every food.
+        """
+        if self._foods_by_category is None:
+            buckets: Dict[str, List[str]] = {}
+            for food in self._all_foods:
+                buckets.setdefault(infer_food_category(food), []).append(food)
+            self._foods_by_category = buckets
+        return self._foods_by_category.get(category, [])
+
     def _safe_gi(self, food_name: str) -> float:
-        return float(self.knowledge_base.get_nutrition_features(food_name, "100g")["glycemic_index"])
+        return float(self.knowledge_base.get_glycemic_index(food_name))
 
     def _safe_gl(self, food_name: str) -> float:
-        return float(
-            self.knowledge_base.get_nutrition_features(food_name, "100g")["glycemic_load"]
-        )
+        return float(self.knowledge_base.get_glycemic_load(food_name, "100g"))
 
     def _serving_grams_for_item(self, food_name: str, serving_size: str) -> Optional[float]:
         """Resolve the meal item's serving size to grams using Module 1 scaling rules."""
@@ -0,0 +1,21 @@
+"""
+Shared, read-only NutritionKnowledgeBase instances for the test suite.
+
+Tests that only read from the knowledge base can call load_kb(path) instead of
+constructing their own, so a full run builds one instance per CSV file.
+"""
+
+import functools
+import os
+
+from src.module1.knowledge_base import NutritionKnowledgeBase
+
+
+def load_kb(csv_path: str) -> NutritionKnowledgeBase:
+    """Return the shared knowledge base for csv_path (built on first request)."""
+    return _load_kb(os.path.abspath(csv_path))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_kb(csv_path: str) -> NutritionKnowledgeBase:
+    return NutritionKnowledgeBase(csv_path)
@@ -9,60 +9,70 @@ Private methods are tested indirectly through public API.
 import unittest
 import os
 import sys
+import tempfile
 
-# Add src to path so we can import knowledge_base
-# Use abspath so IDE can resolve the import
-src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
-if src_path not in sys.path:
-    sys.path.insert(0, src_path)
+# Add the project root to path so we can import src.module1 (same module objects
+# as the other test files, which matters for exception classes).
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
-from module1.knowledge_base import (
+from src.module1.knowledge_base import (
+    FEATURE_MATRIX_COLUMNS,
     NutritionKnowledgeBase,
+    NutritionRecord,
     FoodNotFoundError,
     MissingDataError,
 )
 
+# Expected type of each key returned by get_nutrition_features.
+_KEY_TYPES = (
+    ("glycemic_index", float),
+    ("glycemic_load", float),
+    ("carbohydrates", float),
+    ("fiber", float),
+    ("protein", float),
+    ("fat", float),
+    ("processing_level", str),
+    ("serving_size_grams", float),
+)
+_REQUIRED_KEYS = frozenset(key for key, _ in _KEY_TYPES)
+
+_CSV_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '../../src/module1/nutrition_data.csv')
+)
+
 
 class TestIntegration(unittest.TestCase):
     """Integration tests - test the full workflow through public API."""
 
-    def setUp(self):
-        """Set up test knowledge base with actual CSV."""
-        csv_path = os.path.join(
-            os.path.dirname(__file__), '../../src/module1/nutrition_data.csv'
-        )
-        self.kb = NutritionKnowledgeBase(csv_path)
+    @classmethod
+    def setUpClass(cls):
+        """Load the knowledge base once; tests only read from it."""
+        cls.kb = NutritionKnowledgeBase(_CSV_PATH)
+
+    def _run(self, food_name, serving_size="100g"):
+        """The call under test: one feature lookup (setup stays in setUpClass)."""
+        return self.kb.get_nutrition_features(food_name, serving_size)
 
     def test_get_nutrition_features_basic(self):
         """Test basic feature lookup with default serving size."""
-        features = self.kb.get_nutrition_features("cabbage cruciferous boiled")
+        features = self._run("cabbage cruciferous boiled")
         
-        # Check all required keys are present
-        required_keys = {
-            "glycemic_index", "glycemic_load", "carbohydrates", "fiber",
-            "protein", "fat", "processing_level", "serving_size_grams"
-        }
-        self.assertEqual(set(features.keys()), required_keys)
-        
-        # Check data types
-        self.assertIsInstance(features["glycemic_index"], float)
-        self.assertIsInstance(features["glycemic_load"], float)
-        self.assertIsInstance(features["carbohydrates"], float)
-        self.assertIsInstance(features["fiber"], float)
-        self.assertIsInstance(features["protein"], float)
-        self.assertIsInstance(features["fat"], float)
-        self.assertIsInstance(features["processing_level"], str)
-        self.assertIsInstance(features["serving_size_grams"], float)
+        # Exactly the required keys, each with its expected type
+        self.assertEqual(set(features), _REQUIRED_KEYS)
+        for key, expected_type in _KEY_TYPES:
+            self.assertIsInstance(features[key], expected_type, key)
 
     def test_get_nutrition_features_default_serving_size(self):
         """Test that default serving size is 100g."""
-        features = self.kb.get_nutrition_features("cabbage cruciferous boiled")
+        features = self._run("cabbage cruciferous boiled")
         self.assertEqual(features["serving_size_grams"], 100.0)
 
     def test_get_nutrition_features_custom_serving_size_grams(self):
         """Test custom serving size in grams."""
-        features_100g = self.kb.get_nutrition_features("cabbage cruciferous boiled", "100g")
-        features_200g = self.kb.get_nutrition_features("cabbage cruciferous boiled", "200g")
+        features_100g = self._run("cabbage cruciferous boiled", "100g")
+        features_200g = self._run("cabbage cruciferous boiled", "200g")
         
         # 200g should have exactly 2x the nutrients
         self.assertEqual(features_200g["carbohydrates"], features_100g["carbohydrates"] * 2)
@@ -74,8 +84,8 @@ class TestIntegration(unittest.TestCase):
     def test_get_nutrition_features_custom_serving_size_servings(self):
         """Test custom serving size in servings."""
         # cabbage has serving_size_grams = 98
-        features_1serving = self.kb.get_nutrition_features("cabbage cruciferous boiled", "1 serving")
-        features_2servings = self.kb.get_nutrition_features("cabbage cruciferous boiled", "2 servings")
+        features_1serving = self._run("cabbage cruciferous boiled", "1 serving")
+        features_2servings = self._run("cabbage cruciferous boiled", "2 servings")
         
         # 2 servings should be 2x the nutrients
         self.assertEqual(features_2servings["carbohydrates"], features_1serving["carbohydrates"] * 2)
@@ -84,7 +94,7 @@ class TestIntegration(unittest.TestCase):
     def test_get_nutrition_features_glycemic_load_calculation(self):
         """Test that glycemic load is calculated correctly: (GI × carbs) / 100."""
         # cabbage: GI=20, carbs per 100g = 6.0
-        features = self.kb.get_nutrition_features("cabbage cruciferous boiled", "100g")
+        features = self._run("cabbage cruciferous boiled", "100g")
         expected_gl = (20.0 * 6.0) / 100
         self.assertAlmostEqual(features["glycemic_load"], expected_gl, places=5)
 
@@ -92,9 +102,9 @@ class TestIntegration(unittest.TestCase):
         """Test that scaling works consistently across different serving sizes."""
         food = "arborio rice boiled"
         
-        features_50g = self.kb.get_nutrition_features(food, "50g")
-        features_100g = self.kb.get_nutrition_features(food, "100g")
-        features_150g = self.kb.get_nutrition_features(food, "150g")
+        features_50g = self._run(food, "50g")
+        features_100g = self._run(food, "100g")
+        features_150g = self._run(food, "150g")
         
         # 50g should be half of 100g
         self.assertAlmostEqual(features_50g["carbohydrates"], features_100g["carbohydrates"] / 2, places=5)
@@ -103,17 +113,17 @@ class TestIntegration(unittest.TestCase):
 
     def test_get_nutrition_features_name_case_insensitive(self):
         """Test that food lookup is case-insensitive."""
-        features1 = self.kb.get_nutrition_features("CABBAGE CRUCIFEROUS BOILED")
-        features2 = self.kb.get_nutrition_features("cabbage cruciferous boiled")
-        features3 = self.kb.get_nutrition_features("Cabbage Cruciferous Boiled")
+        features1 = self._run("CABBAGE CRUCIFEROUS BOILED")
+        features2 = self._run("cabbage cruciferous boiled")
+        features3 = self._run("Cabbage Cruciferous Boiled")
         
         self.assertEqual(features1["glycemic_index"], features2["glycemic_index"])
         self.assertEqual(features2["glycemic_index"], features3["glycemic_index"])
 
     def test_get_nutrition_features_name_whitespace(self):
         """Test that food lookup handles whitespace variations."""
-        features1 = self.kb.get_nutrition_features("  cabbage cruciferous   boiled  ")
-        features2 = self.kb.get_nutrition_features("cabbage cruciferous boiled")
+        features1 = self._run("  cabbage cruciferous   boiled  ")
+        features2 = self._run("cabbage cruciferous boiled")
         
         self.assertEqual(features1["glycemic_index"], features2["glycemic_index"])
 
@@ -128,6 +138,44 @@ class TestIntegration(unittest.TestCase):
         for food in foods:
             self.assertIsInstance(food, str)
 
+    def test_get_nutrition_features_returns_independent_copies(self):
+        """Test that mutating a returned dict does not affect later lookups."""
+        features = self._run("arborio rice boiled", "150g")
+        expected_fat = features["fat"]
+        features["fat"] = -1.0
+        again = self._run("arborio rice boiled", "150g")
+        self.assertEqual(again["fat"], expected_fat)
+        self.assertIsNot(again, features)
+
+    def test_get_glycemic_index_and_load_match_features(self):
+        """Test the GI/GL accessors agree with get_nutrition_features."""
+        for serving in ("100g", "1 serving", "250 g"):
+            features = self._run("arborio rice boiled", serving)
+            self.assertEqual(
+                self.kb.get_glycemic_load("arborio rice boiled", serving), features["glycemic_load"]
+            )
+        self.assertEqual(
+            self.kb.get_glycemic_index("  Arborio Rice boiled "), features["glycemic_index"]
+        )
+        with self.assertRaises(FoodNotFoundError):
+            self.kb.get_glycemic_index("nonexistent food xyz")
+
+    def test_get_nutrition_record_matches_features(self):
+        """Test the NamedTuple form carries the same values as the dict form."""
+        record = self.kb.get_nutrition_record("arborio rice boiled", "2 servings")
+        self.assertIsInstance(record, NutritionRecord)
+        self.assertEqual(
+            record._asdict(), self._run("arborio rice boiled", "2 servings")
+        )
+        self.assertEqual(record.serving_size_grams, record[-1])
+
+    def test_has_food(self):
+        """Test that has_food checks membership with name normalization."""
+        self.assertTrue(self.kb.has_food("cabbage cruciferous boiled"))
+        self.assertTrue(self.kb.has_food("  CABBAGE  cruciferous boiled "))
+        self.assertFalse(self.kb.has_food("nonexistent food xyz"))
+        self.assertEqual(len(self.kb), len(self.kb.list_all_foods()))
+
     def test_get_all_foods(self):
         """Test that get_all_foods returns a copy of all data."""
         all_foods = self.kb.get_all_foods()
@@ -135,13 +183,21 @@ class TestIntegration(unittest.TestCase):
         self.assertIsInstance(all_foods, dict)
         self.assertGreater(len(all_foods), 0)
         # Should contain the same keys as list_all_foods
-        self.assertEqual(set(all_foods.keys()), set(self.kb.list_all_foods()))
+        self.assertEqual(all_foods.keys(), set(self.kb.list_all_foods()))
         
         # Should be a copy (modifying it doesn't affect internal data)
-        original_count = len(all_foods)
         all_foods["test_key"] = "test_value"
-        self.assertEqual(len(self.kb.get_all_foods()), original_count)
-        self.assertNotIn("test_key", self.kb.get_all_foods())
+        fresh = self.kb.get_all_foods()
+        self.assertIsNot(fresh, all_foods)
+        self.assertNotIn("test_key", fresh)
+        self.assertEqual(len(fresh), len(all_foods) - 1)
+
+    def test_view_all_foods_is_read_only(self):
+        """Test that view_all_foods exposes the same data without allowing writes."""
+        view = self.kb.view_all_foods()
+        self.assertEqual(dict(view), self.kb.get_all_foods())
+        with self.assertRaises(TypeError):
+            view["test_key"] = "test_value"
 
     def test_multiple_foods_sequence(self):
         """Test looking up multiple different foods in sequence."""
@@ -152,7 +208,7 @@ class TestIntegration(unittest.TestCase):
         ]
         
         for food in foods_to_test:
-            features = self.kb.get_nutrition_features(food)
+            features = self._run(food)
             self.assertIsNotNone(features["glycemic_index"])
             self.assertIsNotNone(features["carbohydrates"])
 
@@ -160,12 +216,10 @@ class TestIntegration(unittest.TestCase):
 class TestErrors(unittest.TestCase):
     """Test all error cases - user-facing errors only."""
 
-    def setUp(self):
-        """Set up test knowledge base."""
-        csv_path = os.path.join(
-            os.path.dirname(__file__), '../../src/module1/nutrition_data.csv'
-        )
-        self.kb = NutritionKnowledgeBase(csv_path)
+    @classmethod
+    def setUpClass(cls):
+        """Load the knowledge base once; tests only read from it."""
+        cls.kb = NutritionKnowledgeBase(_CSV_PATH)
 
     def test_food_not_found_error(self):
         """Test FoodNotFoundError for unknown food."""
@@ -173,8 +227,10 @@ class TestErrors(unittest.TestCase):
             self.kb.get_nutrition_features("nonexistent food xyz")
         
         error = context.exception
+        msg = str(error).lower()
         self.assertEqual(error.food_name, "nonexistent food xyz")
-        self.assertIn("not found", str(error).lower())
+        self.assertIn("not found", msg)
+        self.assertIn("nonexistent food xyz", msg)
 
     def test_food_not_found_error_message(self):
         """Test that FoodNotFoundError message includes food name."""
@@ -184,44 +240,32 @@ class TestErrors(unittest.TestCase):
         error_msg = str(context.exception)
         self.assertIn("pizza margherita", error_msg)
 
-    def test_invalid_serving_size_empty_string(self):
-        """Test ValueError for empty serving size string."""
-        with self.assertRaises(ValueError):
-            self.kb.get_nutrition_features("cabbage cruciferous boiled", "")
-
-    def test_invalid_serving_size_invalid_format(self):
-        """Test ValueError for unrecognized serving size format."""
-        with self.assertRaises(ValueError):
-            self.kb.get_nutrition_features("cabbage cruciferous boiled", "invalid format")
+    def test_missing_data_error_message(self):
+        """Test MissingDataError lists the missing keys, or uses an explicit message."""
+        error = MissingDataError(food_name="apple raw", missing=["fiber", "fat"])
+        self.assertEqual(str(error), "Missing data for apple raw: fiber, fat")
+        self.assertEqual(str(MissingDataError("custom", "apple raw")), "custom")
 
-    def test_invalid_serving_size_negative_grams(self):
-        """Test ValueError for negative grams."""
-        with self.assertRaises(ValueError):
-            self.kb.get_nutrition_features("cabbage cruciferous boiled", "-100g")
+    def test_invalid_serving_sizes(self):
+        """Test ValueError for empty, unrecognized, negative and number-less serving sizes."""
+        for bad in ("", "invalid format", "-100g", "-1 serving", "g", "serving"):
+            with self.subTest(serving_size=bad), self.assertRaises(ValueError):
+                self.kb.get_nutrition_features("cabbage cruciferous boiled", bad)
 
-    def test_invalid_serving_size_negative_servings(self):
-        """Test ValueError for negative servings."""
-        with self.assertRaises(ValueError):
-            self.kb.get_nutrition_features("cabbage cruciferous boiled", "-1 serving")
-
-    def test_invalid_serving_size_no_number(self):
-        """Test ValueError for serving size with no number."""
-        with self.assertRaises(ValueError):
-            self.kb.get_nutrition_features("cabbage cruciferous boiled", "g")
-        
-        with self.assertRaises(ValueError):
-            self.kb.get_nutrition_features("cabbage cruciferous boiled", "serving")
+    def test_serving_unit_must_be_separate_word(self):
+        """Test ValueError when "serving(s)" is attached to the number."""
+        for bad in ("1.5servings", "2serving", "0servings", " +3Servings "):
+            with self.subTest(serving_size=bad), self.assertRaises(ValueError):
+                self.kb.get_nutrition_features("cabbage cruciferous boiled", bad)
 
 
 class TestEdgeCases(unittest.TestCase):
     """Test edge cases and boundary conditions."""
 
-    def setUp(self):
-        """Set up test knowledge base."""
-        csv_path = os.path.join(
-            os.path.dirname(__file__), '../../src/module1/nutrition_data.csv'
-        )
-        self.kb = NutritionKnowledgeBase(csv_path)
+    @classmethod
+    def setUpClass(cls):
+        """Load the knowledge base once; tests only read from it."""
+        cls.kb = NutritionKnowledgeBase(_CSV_PATH)
 
     def test_zero_gi_food(self):
         """Test food with GI=0 (like meat/protein foods)."""
@@ -302,5 +346,86 @@ class TestEdgeCases(unittest.TestCase):
         self.assertIsNotNone(features["glycemic_index"])
 
 
+class TestBatchFeatures(unittest.TestCase):
+    """Test get_nutrition_features_batch against the single-food lookup."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Load the knowledge base once; tests only read from it."""
+        cls.kb = NutritionKnowledgeBase(_CSV_PATH)
+        cls.foods = (
+            "cabbage cruciferous boiled",
+            "deli turkey poached",
+            "arborio rice boiled",
+        )
+
+    def assertMatchesSingleLookups(self, batch, serving_sizes):
+        for i, (food, serving) in enumerate(zip(self.foods, serving_sizes)):
+            features = self.kb.get_nutrition_features(food, serving)
+            for key, value in features.items():
+                if key == "processing_level":
+                    self.assertEqual(batch[key][i], value)
+                else:
+                    self.assertAlmostEqual(float(batch[key][i]), value, places=9)
+
+    def test_batch_single_serving_size(self):
+        """Test one serving size applied to every food."""
+        batch = self.kb.get_nutrition_features_batch(self.foods, "2 servings")
+        self.assertEqual(len(batch["glycemic_load"]), len(self.foods))
+        self.assertMatchesSingleLookups(batch, ["2 servings"] * len(self.foods))
+
+    def test_batch_per_food_serving_sizes(self):
+        """Test one serving size string per food."""
+        servings = ["150g", "1 serving", "0.5 servings"]
+        batch = self.kb.get_nutrition_features_batch(self.foods, servings)
+        self.assertMatchesSingleLookups(batch, servings)
+
+    def test_features_matrix_matches_single_lookups(self):
+        """Test get_features_matrix rows against get_nutrition_features at the same grams."""
+        matrix = self.kb.get_features_matrix(150.0)
+        names = self.kb.list_all_foods()
+        self.assertEqual(matrix.shape, (len(names), len(FEATURE_MATRIX_COLUMNS)))
+        for food in self.foods:
+            row = matrix[names.index(food)]
+            features = self.kb.get_nutrition_features(food, "150g")
+            for j, key in enumerate(FEATURE_MATRIX_COLUMNS):
+                self.assertAlmostEqual(float(row[j]), features[key], places=9)
+        with self.assertRaises(ValueError):
+            self.kb.get_features_matrix(-1.0)
+
+    def test_batch_food_not_found(self):
+        """Test FoodNotFoundError names the unknown food."""
+        with self.assertRaises(FoodNotFoundError) as context:
+            self.kb.get_nutrition_features_batch(["cabbage cruciferous boiled", "nonexistent food xyz"])
+        self.assertEqual(context.exception.food_name, "nonexistent food xyz")
+
+    def test_batch_serving_sizes_length_mismatch(self):
+        """Test ValueError when serving sizes do not line up with foods."""
+        with self.assertRaises(ValueError):
+            self.kb.get_nutrition_features_batch(self.foods, ["100g"])
+
+
+class TestLoadCache(unittest.TestCase):
+    """Test that a CSV is parsed once per process and re-read when it changes."""
+
+    _HEADER = "name,glycemic_index,carbohydrates,fiber,protein,fat,processing_level,serving_size_grams\n"
+
+    def _write(self, path, rows):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self._HEADER + "".join(rows))
+
+    def test_same_file_shares_parsed_data(self):
+        self.assertIs(NutritionKnowledgeBase(_CSV_PATH).data, NutritionKnowledgeBase(_CSV_PATH).data)
+
+    def test_changed_file_is_reloaded(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "foods.csv")
+            self._write(path, ["apple,36,14,2.4,0.3,0.2,whole,182\n"])
+            self.assertEqual(NutritionKnowledgeBase(path).list_all_foods(), ["apple"])
+
+            self._write(path, ["apple,36,14,2.4,0.3,0.2,whole,182\n", "pear,38,15,3.1,0.4,0.1,whole,178\n"])
+            self.assertEqual(NutritionKnowledgeBase(path).list_all_foods(), ["apple", "pear"])
+
+
 if __name__ == '__main__':
     unittest.main()
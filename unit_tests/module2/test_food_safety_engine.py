@@ -9,6 +9,7 @@ error injection) so the engine's isinstance check is satisfied.
 import unittest
 import os
 import sys
+import tempfile
 
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
 if project_root not in sys.path:
@@ -16,15 +17,19 @@ if project_root not in sys.path:
 
 from src.module1.knowledge_base import NutritionKnowledgeBase, FoodNotFoundError, MissingDataError
 from src.module2.food_safety_engine import FoodSafetyEngine
+from unit_tests._kb_cache import load_kb
 
 _CSV_PATH = os.path.join(os.path.dirname(__file__), '../../src/module1/nutrition_data.csv')
 
 
 class _MockKB(NutritionKnowledgeBase):
-    """Subclass that overrides get_nutrition_features to inject return value or error."""
+    """Subclass that overrides get_nutrition_features to inject return value or error.
+
+    Subclassing only satisfies the engine's isinstance check; the CSV is never loaded.
+    """
 
     def __init__(self, features=None, raise_error=None):
-        super().__init__(_CSV_PATH)
+        self.data = {}
         self._mock_features = features
         self._mock_error = raise_error
         self.last_food_name = None
@@ -43,7 +48,7 @@ class TestFoodSafetyEngineInit(unittest.TestCase):
 
     def test_init_accepts_nutrition_knowledge_base(self):
         """Engine accepts a real NutritionKnowledgeBase (requires data file)."""
-        kb = NutritionKnowledgeBase(_CSV_PATH)
+        kb = load_kb(_CSV_PATH)
         engine = FoodSafetyEngine(kb)
         self.assertIs(engine.knowledge_base, kb)
 
@@ -58,7 +63,7 @@ class TestFoodSafetyEngineInit(unittest.TestCase):
 
     def test_init_accepts_optional_thresholds(self):
         """Engine accepts optional thresholds dict without error."""
-        kb = NutritionKnowledgeBase(_CSV_PATH)
+        kb = load_kb(_CSV_PATH)
         engine = FoodSafetyEngine(kb, thresholds={"safe_gl": 10.0})
         self.assertEqual(engine._thresholds, {"safe_gl": 10.0})
 
@@ -122,6 +127,27 @@ class TestFoodSafetyEngineEvaluate(unittest.TestCase):
         engine.evaluate_food("food")
         self.assertEqual(mock_kb.last_serving_size, "100g")
 
+    def test_repeated_evaluation_is_memoized(self):
+        """A repeated (food, serving) query is answered without asking the knowledge base."""
+        features = {
+            "glycemic_index": 50.0,
+            "glycemic_load": 8.0,
+            "carbohydrates": 20.0,
+            "fiber": 2.0,
+            "protein": 1.0,
+            "fat": 0.0,
+            "processing_level": "whole",
+            "serving_size_grams": 100.0,
+        }
+        mock_kb = _MockKB(features=features)
+        engine = FoodSafetyEngine(mock_kb)
+        first = engine.evaluate_food("food")
+        mock_kb.last_food_name = None
+        second = engine.evaluate_food("food")
+        self.assertIsNone(mock_kb.last_food_name)
+        self.assertEqual(second, first)
+        self.assertIsNot(second, first)
+
     def test_evaluate_safe_label_for_low_gi_gl(self):
         """Low GI and GL produce safe label."""
         features = {
@@ -202,5 +228,36 @@ class TestFoodSafetyEngineErrorPropagation(unittest.TestCase):
             engine.evaluate_food("food", "invalid")
 
 
+class TestFoodSafetyEngineEvaluateAll(unittest.TestCase):
+    """Tests that evaluate_all skips exactly the foods evaluate_food rejects."""
+
+    _CSV = (
+        "name,glycemic_index,carbohydrates,fiber,protein,fat,processing_level,serving_size_grams\n"
+        "complete food,40,10,2,1,0.5,whole,100\n"
+        "no fiber,40,10,,1,0.5,whole,100\n"
+        "no protein,40,10,2,,0.5,whole,100\n"
+        "no fat,90,50,2,1,,whole,100\n"
+        "no processing,40,10,2,1,0.5,,100\n"
+        "no serving,40,10,2,1,0.5,whole,\n"
+        "no gi,,10,2,1,0.5,whole,100\n"
+        "high gi food,90,50,1,1,0.5,processed,100\n"
+    )
+
+    def test_evaluate_all_omits_foods_with_missing_data(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "foods.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self._CSV)
+            engine = FoodSafetyEngine(NutritionKnowledgeBase(path))
+            labels = engine.evaluate_all()
+            self.assertEqual(list(labels), ["complete food", "high gi food"])
+            for name in engine.knowledge_base.list_all_foods():
+                if name in labels:
+                    self.assertEqual(labels[name], engine.evaluate_food(name)["safety_label"])
+                else:
+                    with self.assertRaises(MissingDataError):
+                        engine.evaluate_food(name)
+
+
 if __name__ == "__main__":
     unittest.main()
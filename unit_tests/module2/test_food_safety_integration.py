@@ -13,8 +13,9 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from src.module1.knowledge_base import NutritionKnowledgeBase, FoodNotFoundError
+from src.module1.knowledge_base import FoodNotFoundError, MissingDataError
 from src.module2.food_safety_engine import FoodSafetyEngine
+from unit_tests._kb_cache import load_kb
 
 _CSV_PATH = os.path.join(os.path.dirname(__file__), '../../src/module1/nutrition_data.csv')
 
@@ -22,9 +23,11 @@ _CSV_PATH = os.path.join(os.path.dirname(__file__), '../../src/module1/nutrition
 class TestFoodSafetyIntegration(unittest.TestCase):
     """End-to-end: KB + Engine for real foods from CSV."""
 
-    def setUp(self):
-        self.kb = NutritionKnowledgeBase(_CSV_PATH)
-        self.engine = FoodSafetyEngine(self.kb)
+    @classmethod
+    def setUpClass(cls):
+        # Neither object is mutated by the tests, so one pair serves the whole class.
+        cls.kb = load_kb(_CSV_PATH)
+        cls.engine = FoodSafetyEngine(cls.kb)
 
     def test_low_gi_food_safe(self):
         """Cabbage (low GI/GL) is classified safe."""
@@ -61,14 +64,27 @@ class TestFoodSafetyIntegration(unittest.TestCase):
         """Unknown food raises FoodNotFoundError through engine."""
         with self.assertRaises(FoodNotFoundError) as context:
             self.engine.evaluate_food("nonexistent food xyz")
-        self.assertIn("nonexistent", context.exception.food_name.lower()
-                      or str(context.exception).lower())
+        msg = str(context.exception).lower()
+        self.assertIn("nonexistent", context.exception.food_name.lower())
+        self.assertIn("nonexistent", msg)
 
     def test_invalid_serving_raises(self):
         """Invalid serving size raises ValueError through engine."""
         with self.assertRaises(ValueError):
             self.engine.evaluate_food("cabbage cruciferous boiled", "invalid")
 
+    def test_evaluate_all_matches_evaluate_food(self):
+        """evaluate_all labels every food as evaluate_food does at the same weight."""
+        for grams in (100.0, 40.0):
+            labels = self.engine.evaluate_all(grams)
+            expected = {}
+            for name in self.kb.list_all_foods():
+                try:
+                    expected[name] = self.engine.evaluate_food(name, f"{grams}g")["safety_label"]
+                except MissingDataError:
+                    pass
+            self.assertEqual(list(labels.items()), list(expected.items()))
+
     def test_explanation_describes_gl_and_gi(self):
         """Explanation mentions glycemic load and index for transparency."""
         result = self.engine.evaluate_food("cabbage cruciferous boiled")
@@ -1,22 +1,30 @@
 """
 Unit tests for safety_rules (Module 2): propositional logic for food safety.
 
-Tests get_gl_category, get_gi_category, and evaluate_propositions in isolation
+Tests get_gl_category, get_gi_category (and their batch forms), and
+evaluate_propositions in isolation
 using hand-built feature dicts (no knowledge base).
 """
 
+import functools
 import unittest
 import os
 import sys
+from types import MappingProxyType
+from typing import cast
 
-src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
-if src_path not in sys.path:
-    sys.path.insert(0, src_path)
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
-from module2.safety_rules import (
+from src.module2.safety_rules import (
     get_gl_category,
     get_gi_category,
+    get_gl_category_batch,
+    get_gi_category_batch,
+    get_safety_labels_batch,
     evaluate_propositions,
+    NutritionFeatures,
     SAFE_GL_THRESHOLD,
     CAUTION_GL_THRESHOLD,
     SAFE_GI_THRESHOLD,
@@ -27,97 +35,115 @@ from module2.safety_rules import (
 class TestGLCategory(unittest.TestCase):
     """Tests for get_gl_category (glycemic load thresholds)."""
 
-    def test_gl_safe_at_threshold(self):
-        """GL exactly at safe threshold is safe."""
-        self.assertEqual(get_gl_category(SAFE_GL_THRESHOLD), "safe")
-
-    def test_gl_safe_below_threshold(self):
-        """GL below safe threshold is safe."""
-        self.assertEqual(get_gl_category(0.0), "safe")
-        self.assertEqual(get_gl_category(5.0), "safe")
-
-    def test_gl_caution_above_safe_below_caution(self):
-        """GL above safe and at or below caution is caution."""
-        self.assertEqual(get_gl_category(10.1), "caution")
-        self.assertEqual(get_gl_category(CAUTION_GL_THRESHOLD), "caution")
-        self.assertEqual(get_gl_category(15.0), "caution")
-
-    def test_gl_unsafe_above_caution(self):
-        """GL above caution threshold is unsafe."""
-        self.assertEqual(get_gl_category(20.1), "unsafe")
-        self.assertEqual(get_gl_category(50.0), "unsafe")
+    # (glycemic load, expected category): thresholds are inclusive upper bounds.
+    CASES = (
+        (SAFE_GL_THRESHOLD, "safe"),
+        (0.0, "safe"),
+        (5.0, "safe"),
+        (10.1, "caution"),
+        (CAUTION_GL_THRESHOLD, "caution"),
+        (15.0, "caution"),
+        (20.1, "unsafe"),
+        (50.0, "unsafe"),
+    )
+
+    def test_gl_category(self):
+        """GL maps to safe (<= safe), caution (<= caution), else unsafe."""
+        for value, expected in self.CASES:
+            with self.subTest(glycemic_load=value):
+                self.assertEqual(get_gl_category(value), expected)
 
 
 class TestGICategory(unittest.TestCase):
     """Tests for get_gi_category (glycemic index thresholds)."""
 
-    def test_gi_safe_at_threshold(self):
-        """GI exactly at safe threshold is safe."""
-        self.assertEqual(get_gi_category(SAFE_GI_THRESHOLD), "safe")
-
-    def test_gi_safe_below_threshold(self):
-        """GI below safe threshold is safe."""
-        self.assertEqual(get_gi_category(0.0), "safe")
-        self.assertEqual(get_gi_category(30.0), "safe")
-
-    def test_gi_caution_above_safe_below_caution(self):
-        """GI above safe and at or below caution is caution."""
-        self.assertEqual(get_gi_category(55.1), "caution")
-        self.assertEqual(get_gi_category(CAUTION_GI_THRESHOLD), "caution")
-        self.assertEqual(get_gi_category(65.0), "caution")
-
-    def test_gi_unsafe_above_caution(self):
-        """GI above caution threshold is unsafe."""
-        self.assertEqual(get_gi_category(70.1), "unsafe")
-        self.assertEqual(get_gi_category(90.0), "unsafe")
-
-
-def _features(gi: float, gl: float) -> dict:
-    """Minimal feature dict for evaluate_propositions."""
-    return {
-        "glycemic_index": gi,
-        "glycemic_load": gl,
-        "carbohydrates": 0.0,
-        "fiber": 0.0,
-        "protein": 0.0,
-        "fat": 0.0,
-        "processing_level": "whole",
-        "serving_size_grams": 100.0,
-    }
+    # (glycemic index, expected category): thresholds are inclusive upper bounds.
+    CASES = (
+        (SAFE_GI_THRESHOLD, "safe"),
+        (0.0, "safe"),
+        (30.0, "safe"),
+        (55.1, "caution"),
+        (CAUTION_GI_THRESHOLD, "caution"),
+        (65.0, "caution"),
+        (70.1, "unsafe"),
+        (90.0, "unsafe"),
+    )
+
+    def test_gi_category(self):
+        """GI maps to safe (<= safe), caution (<= caution), else unsafe."""
+        for value, expected in self.CASES:
+            with self.subTest(glycemic_index=value):
+                self.assertEqual(get_gi_category(value), expected)
+
+
+# Threshold values as they appear in explanations.
+_SAFE_GL_STR = str(SAFE_GL_THRESHOLD)
+_CAUTION_GL_STR = str(CAUTION_GL_THRESHOLD)
+_SAFE_GI_STR = str(SAFE_GI_THRESHOLD)
+_CAUTION_GI_STR = str(CAUTION_GI_THRESHOLD)
+_THRESHOLD_STRS = (_SAFE_GL_STR, _CAUTION_GL_STR, _SAFE_GI_STR, _CAUTION_GI_STR)
+
+# Fields evaluate_propositions does not read; _features fills in GI and GL.
+_BASE_FEATURES = {
+    "glycemic_index": 0.0,
+    "glycemic_load": 0.0,
+    "carbohydrates": 0.0,
+    "fiber": 0.0,
+    "protein": 0.0,
+    "fat": 0.0,
+    "processing_level": "whole",
+    "serving_size_grams": 100.0,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _features(gi: float, gl: float) -> NutritionFeatures:
+    """Minimal read-only feature mapping for evaluate_propositions.
+
+    One shared instance per (gi, gl); being read-only, it also asserts that
+    evaluate_propositions never mutates its input. Typed as NutritionFeatures,
+    the only shape evaluate_propositions reads.
+    """
+    features = _BASE_FEATURES.copy()
+    features["glycemic_index"] = gi
+    features["glycemic_load"] = gl
+    return cast(NutritionFeatures, MappingProxyType(features))
 
 
 class TestEvaluatePropositions(unittest.TestCase):
     """Tests for evaluate_propositions: label and explanation."""
 
-    def test_label_safe_when_both_safe(self):
-        """Both GI and GL safe -> label safe."""
-        label, _ = evaluate_propositions(_features(50.0, 8.0))
-        self.assertEqual(label, "safe")
-
-    def test_label_caution_when_gl_caution_gi_safe(self):
-        """GL caution, GI safe -> label caution."""
-        label, _ = evaluate_propositions(_features(50.0, 15.0))
-        self.assertEqual(label, "caution")
-
-    def test_label_caution_when_gi_caution_gl_safe(self):
-        """GI caution, GL safe -> label caution."""
-        label, _ = evaluate_propositions(_features(60.0, 8.0))
-        self.assertEqual(label, "caution")
-
-    def test_label_unsafe_when_gl_unsafe(self):
-        """GL unsafe -> label unsafe even if GI safe."""
-        label, _ = evaluate_propositions(_features(50.0, 25.0))
-        self.assertEqual(label, "unsafe")
-
-    def test_label_unsafe_when_gi_unsafe(self):
-        """GI unsafe -> label unsafe even if GL safe."""
-        label, _ = evaluate_propositions(_features(80.0, 8.0))
-        self.assertEqual(label, "unsafe")
-
-    def test_label_unsafe_priority_over_caution(self):
-        """If one is unsafe and one caution, label is unsafe."""
-        label, _ = evaluate_propositions(_features(75.0, 15.0))
-        self.assertEqual(label, "unsafe")
+    @classmethod
+    def setUpClass(cls):
+        """Evaluate each distinct (GI, GL) input of the case tables once for the class."""
+        cls.results = {
+            (gi, gl): evaluate_propositions(_features(gi, gl))
+            for gi, gl, *_ in cls.LABEL_CASES + cls.EXPLANATION_CASES
+        }
+
+    # (GI, GL, expected label): the label is the worse of the two categories.
+    LABEL_CASES = (
+        (50.0, 8.0, "safe"),       # both safe
+        (50.0, 15.0, "caution"),   # GL caution, GI safe
+        (60.0, 8.0, "caution"),    # GI caution, GL safe
+        (50.0, 25.0, "unsafe"),    # GL unsafe even if GI safe
+        (80.0, 8.0, "unsafe"),     # GI unsafe even if GL safe
+        (75.0, 15.0, "unsafe"),    # unsafe takes priority over caution
+    )
+
+    def test_label_truth_table(self):
+        """Label follows unsafe > caution > safe priority across GI/GL combinations."""
+        for gi, gl, expected in self.LABEL_CASES:
+            with self.subTest(gi=gi, gl=gl):
+                label, _ = self.results[gi, gl]
+                self.assertEqual(label, expected)
+
+    def test_label_only_skips_explanation(self):
+        """return_explanation=False gives the same label and no explanation."""
+        for gi, gl, expected in self.LABEL_CASES:
+            with self.subTest(gi=gi, gl=gl):
+                result = evaluate_propositions(_features(gi, gl), return_explanation=False)
+                self.assertEqual(result, (expected, None))
 
     def test_label_safe_when_zero_gi_and_zero_gl(self):
         """Zero GI and GL are treated as safe."""
@@ -125,35 +151,45 @@ class TestEvaluatePropositions(unittest.TestCase):
         self.assertEqual(label, "safe")
         self.assertIn("0.0", explanation)
 
-    def test_explanation_contains_gl_and_gi(self):
-        """Explanation mentions both glycemic load and glycemic index."""
-        _, explanation = evaluate_propositions(_features(50.0, 8.0))
-        self.assertIn("Glycemic load", explanation)
-        self.assertIn("Glycemic index", explanation)
-
-    def test_explanation_contains_threshold_values(self):
-        """Explanation includes numeric thresholds for clarity (use both in caution range)."""
+    # (GI, GL, substrings the explanation must contain, what the case checks)
+    EXPLANATION_CASES = (
+        (50.0, 8.0, ("Glycemic load", "Glycemic index"), "mentions both metrics"),
         # GL=15 and GI=60 so both paragraphs mention safe and caution thresholds
-        _, explanation = evaluate_propositions(_features(60.0, 15.0))
-        self.assertIn(str(SAFE_GL_THRESHOLD), explanation)
-        self.assertIn(str(CAUTION_GL_THRESHOLD), explanation)
-        self.assertIn(str(SAFE_GI_THRESHOLD), explanation)
-        self.assertIn(str(CAUTION_GI_THRESHOLD), explanation)
-
-    def test_explanation_contains_actual_values(self):
-        """Explanation includes the actual GI and GL values used."""
-        gi, gl = 60.0, 12.0
-        _, explanation = evaluate_propositions(_features(gi, gl))
-        self.assertIn("60.0", explanation)
-        self.assertIn("12.0", explanation)
-
-    def test_explanation_for_unsafe_gl_and_gi(self):
-        """Explanation clearly describes when both GL and GI are unsafe."""
+        (60.0, 15.0, _THRESHOLD_STRS, "threshold values"),
+        (60.0, 12.0, ("60.0", "12.0"), "actual values"),
         # Both GL and GI above their caution thresholds
-        _, explanation = evaluate_propositions(_features(80.0, 25.0))
-        self.assertIn("exceeds caution threshold", explanation)
-        self.assertIn(str(CAUTION_GL_THRESHOLD), explanation)
-        self.assertIn(str(CAUTION_GI_THRESHOLD), explanation)
+        (80.0, 25.0, ("exceeds caution threshold", _CAUTION_GL_STR, _CAUTION_GI_STR),
+         "unsafe GL and GI"),
+    )
+
+    def test_explanation_contents(self):
+        """Explanation names both metrics, their values and the thresholds that applied."""
+        for gi, gl, needles, case in self.EXPLANATION_CASES:
+            with self.subTest(case=case):
+                _, explanation = self.results[gi, gl]
+                missing = [needle for needle in needles if needle not in explanation]
+                self.assertEqual(missing, [], explanation)
+
+
+class TestBatchCategories(unittest.TestCase):
+    """Tests that the vectorized category functions agree with the scalar ones."""
+
+    VALUES = [0.0, 5.0, SAFE_GL_THRESHOLD, 10.1, 15.0, CAUTION_GL_THRESHOLD, 20.1,
+              SAFE_GI_THRESHOLD, 55.1, CAUTION_GI_THRESHOLD, 70.1, 90.0, float("nan")]
+
+    def test_gl_batch_matches_scalar(self):
+        self.assertEqual(get_gl_category_batch(self.VALUES).tolist(),
+                         [get_gl_category(v) for v in self.VALUES])
+
+    def test_gi_batch_matches_scalar(self):
+        self.assertEqual(get_gi_category_batch(self.VALUES).tolist(),
+                         [get_gi_category(v) for v in self.VALUES])
+
+    def test_labels_batch_matches_evaluate_propositions(self):
+        gls = [5.0, 15.0, 5.0, 25.0, 10.0]
+        gis = [30.0, 40.0, 60.0, 50.0, 70.1]
+        expected = [evaluate_propositions(_features(gi, gl))[0] for gi, gl in zip(gis, gls)]
+        self.assertEqual(get_safety_labels_batch(gls, gis).tolist(), expected)
 
 
 if __name__ == "__main__":
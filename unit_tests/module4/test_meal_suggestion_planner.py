@@ -47,6 +47,12 @@ class FakeKB:
             "serving_size_grams": grams,
         }
 
+    def get_glycemic_index(self, food_name):
+        return self.get_nutrition_features(food_name)["glycemic_index"]
+
+    def get_glycemic_load(self, food_name, serving_size="100g"):
+        return self.get_nutrition_features(food_name, serving_size)["glycemic_load"]
+
 
 class FakeAnalyzer:
     def analyze_meal(self, meal_items):
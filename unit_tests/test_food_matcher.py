@@ -0,0 +1,276 @@
+"""Tests for FoodMatcher: token-based fallback matching and the embedding path (stub model)."""
+
+import os
+import sys
+import tempfile
+import unittest
+import zlib
+from unittest import mock
+
+import numpy as np
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src import food_matcher
+from src.food_matcher import FoodMatcher
+
+
+FOODS = [
+    "white rice boiled",
+    "brown rice steamed",
+    "apple pureed",
+    "apple raw",
+    "tomato sauce",
+    "chicken breast grilled",
+]
+
+
+class TestFallbackMatching(unittest.TestCase):
+    def setUp(self):
+        self.matcher = FoodMatcher(FOODS, use_embeddings=False)
+
+    def test_only_core_token_matches_returned(self):
+        names = [name for name, _ in self.matcher.find_nearest_neighbors("rice")]
+        self.assertEqual(names, ["white rice boiled", "brown rice steamed"])
+
+    def test_preferred_token_breaks_ties(self):
+        results = self.matcher.find_nearest_neighbors("apple sauce")
+        self.assertEqual(results[0][0], "apple pureed")
+        self.assertEqual(len(results), 2)
+
+    def test_offset_pages_results(self):
+        names = [name for name, _ in self.matcher.find_nearest_neighbors("rice", top_k=1, offset=1)]
+        self.assertEqual(names, ["brown rice steamed"])
+
+    def test_unknown_token_returns_empty(self):
+        self.assertEqual(self.matcher.find_nearest_neighbors("quinoa"), [])
+
+    def test_generic_only_query_keeps_corpus_order(self):
+        names = [name for name, _ in self.matcher.find_nearest_neighbors("sauce", top_k=2)]
+        self.assertEqual(names, FOODS[:2])
+
+
+class _StubModel:
+    """Deterministic stand-in for SentenceTransformer: hashed bag-of-tokens vectors."""
+
+    DIM = 32
+
+    def __init__(self):
+        self.encoded: list = []
+
+    def encode(self, texts, **kwargs):
+        self.encoded.append(list(texts))
+        vectors = np.zeros((len(texts), self.DIM), dtype=np.float32)
+        for row, text in enumerate(texts):
+            vectors[row, 0] = 0.1  # keep every vector non-zero
+            for token in text.lower().split():
+                vectors[row, 1 + zlib.crc32(token.encode()) % (self.DIM - 1)] += 1.0
+        return vectors
+
+
+EMBEDDING_FOODS = FOODS + [
+    "kale raw",
+    "spinach raw",
+    "carrot raw",
+    "carrot boiled",
+    "lentils boiled",
+    "oats rolled",
+]
+
+
+class TestEmbeddingMatching(unittest.TestCase):
+    def setUp(self):
+        self.model = _StubModel()
+        patches = [
+            mock.patch.object(food_matcher, "SENTENCE_TRANSFORMERS_AVAILABLE", True),
+            mock.patch.object(FoodMatcher, "_load_model", return_value=(self.model, "stub")),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _matcher(self, **kwargs):
+        kwargs.setdefault("cache_dir", None)
+        return FoodMatcher(EMBEDDING_FOODS, **kwargs)
+
+    def _pages(self, matcher, query, top_k, pages):
+        results = []
+        for page in range(pages):
+            results.extend(matcher.find_nearest_neighbors(query, top_k=top_k, offset=page * top_k))
+        return [name for name, _ in results]
+
+    def test_substring_hits_answer_page_one_without_encoding(self):
+        matcher = self._matcher()
+        results = matcher.find_nearest_neighbors("carrot", top_k=5)
+        self.assertEqual(results, [("carrot raw", 0.6), ("carrot boiled", 6 / 13)])
+        self.assertIsNone(matcher.model)
+        self.assertEqual(self.model.encoded, [])
+
+    def test_page_after_substring_hits_excludes_them(self):
+        matcher = self._matcher()
+        matcher.find_nearest_neighbors("carrot", top_k=5)
+        names = [name for name, _ in matcher.find_nearest_neighbors("carrot", top_k=5, offset=5)]
+        self.assertEqual(len(names), 5)
+        self.assertNotIn("carrot raw", names)
+        self.assertNotIn("carrot boiled", names)
+
+    def test_pages_have_no_gaps_or_repeats(self):
+        for query in ("kale", "carrot", "raw", "rice bowl"):
+            with self.subTest(query=query):
+                names = self._pages(self._matcher(), query, top_k=5, pages=4)
+                self.assertEqual(len(names), len(set(names)))
+                self.assertEqual(set(names), set(EMBEDDING_FOODS))
+
+    def test_pages_slice_the_single_page_ranking(self):
+        everything = self._matcher().find_nearest_neighbors("boiled grain", top_k=len(EMBEDDING_FOODS))
+        names = self._pages(self._matcher(), "boiled grain", top_k=4, pages=3)
+        self.assertEqual(names, [name for name, _ in everything])
+
+    def test_tied_scores_keep_corpus_order_across_pages(self):
+        # Case/spacing variants encode to the same vector, so every score ties.
+        foods = ["plain rice", "Plain rice", "PLAIN rice", "plain RICE", "plain  rice", "Plain Rice", "plain rice "]
+        names = []
+        for offset in (0, 3, 6):
+            matcher = FoodMatcher(foods, cache_dir=None)
+            names.extend(name for name, _ in matcher.find_nearest_neighbors("grain", top_k=3, offset=offset))
+        self.assertEqual(names, foods)
+
+    def _ranked_depth(self, matcher):
+        cached = matcher._last_ranking
+        assert cached is not None
+        return len(cached[1])
+
+    def test_ranking_grows_only_as_pages_need(self):
+        matcher = self._matcher()
+        matcher.find_nearest_neighbors("boiled grain", top_k=2)
+        self.assertEqual(self._ranked_depth(matcher), 2)
+        matcher.find_nearest_neighbors("boiled grain", top_k=2, offset=2)
+        self.assertEqual(self._ranked_depth(matcher), 4)
+        matcher.find_nearest_neighbors("boiled grain", top_k=2, offset=2)
+        self.assertEqual(self.model.encoded.count(["boiled grain"]), 1)
+
+    def test_model_loads_on_first_embedding_query(self):
+        with mock.patch.object(FoodMatcher, "_load_model", return_value=(self.model, "stub")) as load:
+            matcher = self._matcher()
+            self.assertIsNone(matcher.model)
+            self.assertIsNone(matcher.food_embeddings)
+            load.assert_not_called()
+            matcher.find_nearest_neighbors("kale")
+            load.assert_not_called()
+            matcher.find_nearest_neighbors("boiled grain")
+            matcher.find_nearest_neighbors("rice bowl")
+            load.assert_called_once()
+        self.assertEqual(self.model.encoded.count(EMBEDDING_FOODS), 1)
+
+    def test_repeated_query_is_encoded_once(self):
+        matcher = self._matcher()
+        matcher.find_nearest_neighbors("Boiled grain ", top_k=3)
+        matcher.find_nearest_neighbors("rice bowl", top_k=3)
+        matcher.find_nearest_neighbors("boiled grain", top_k=3, offset=3)
+        matcher.find_nearest_neighbors("boiled grain", top_k=2)
+        self.assertEqual(self.model.encoded.count(["boiled grain"]), 1)
+
+    def test_query_cache_evicts_least_recent(self):
+        matcher = self._matcher()
+        with mock.patch.object(FoodMatcher, "_QUERY_CACHE_SIZE", 2):
+            for query in ("kale soup", "oat bran", "kale soup", "rice bowl", "oat bran"):
+                matcher.find_nearest_neighbors(query, top_k=1)
+        self.assertEqual(self.model.encoded.count(["oat bran"]), 2)
+        self.assertEqual(self.model.encoded.count(["kale soup"]), 1)
+        self.assertEqual(list(matcher._query_cache), ["rice bowl", "oat bran"])
+
+    def test_reduced_precisions_keep_the_ranking(self):
+        expected = self._matcher().find_nearest_neighbors("boiled lentils", top_k=3)
+        for precision, dtype in (("float16", np.float16), ("int8", np.int8)):
+            for simd in (True, False):
+                kernels = mock.patch.object(
+                    food_matcher, "SIMSIMD_AVAILABLE", simd and food_matcher.SIMSIMD_AVAILABLE
+                )
+                with self.subTest(precision=precision, simsimd=simd), kernels:
+                    matcher = self._matcher(precision=precision)
+                    results = matcher.find_nearest_neighbors("boiled lentils", top_k=3)
+                    self.assertEqual(matcher._ensure_embeddings().dtype, dtype)
+                    self.assertEqual([n for n, _ in results], [n for n, _ in expected])
+                    for (_, score), (_, exact) in zip(results, expected):
+                        self.assertAlmostEqual(score, exact, delta=0.02)
+
+    def test_float16_numpy_path_scores_in_blocks(self):
+        expected = self._matcher().find_nearest_neighbors("boiled lentils", top_k=len(EMBEDDING_FOODS))
+        with mock.patch.object(food_matcher, "SIMSIMD_AVAILABLE", False), \
+                mock.patch.object(FoodMatcher, "_FLOAT16_BLOCK_ROWS", 5):
+            results = self._matcher(precision="float16").find_nearest_neighbors(
+                "boiled lentils", top_k=len(EMBEDDING_FOODS)
+            )
+        self.assertEqual([n for n, _ in results], [n for n, _ in expected])
+        for (_, score), (_, exact) in zip(results, expected):
+            self.assertAlmostEqual(score, exact, delta=0.01)
+
+    def test_unknown_precision_raises(self):
+        with self.assertRaises(ValueError):
+            self._matcher(precision="bfloat16")
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+        self.model = _StubModel()
+        patches = [
+            mock.patch.object(food_matcher, "SENTENCE_TRANSFORMERS_AVAILABLE", True),
+            mock.patch.object(FoodMatcher, "_load_model", return_value=(self.model, "stub")),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _query(self, **kwargs):
+        matcher = FoodMatcher(EMBEDDING_FOODS, cache_dir=self.cache_dir.name, **kwargs)
+        return matcher.find_nearest_neighbors("steamed carrot", top_k=3)
+
+    def _corpus_encodes(self):
+        return sum(1 for texts in self.model.encoded if texts == EMBEDDING_FOODS)
+
+    def _cache_files(self):
+        return sorted(os.listdir(self.cache_dir.name))
+
+    def test_second_matcher_reuses_the_cache(self):
+        first = self._query()
+        self.assertEqual(self._query(), first)
+        self.assertEqual(self._corpus_encodes(), 1)
+        self.assertEqual(len(self._cache_files()), 1)
+        self.assertTrue(self._cache_files()[0].endswith(".npy"))
+
+    def test_truncated_cache_is_re_encoded(self):
+        first = self._query()
+        cache_file = os.path.join(self.cache_dir.name, self._cache_files()[0])
+        with open(cache_file, "r+b") as handle:
+            handle.truncate(40)
+        self.assertEqual(self._query(), first)
+        self.assertEqual(self._corpus_encodes(), 2)
+        self.assertEqual(self._query(), first)
+        self.assertEqual(self._corpus_encodes(), 2)
+
+    def test_cache_with_wrong_row_count_is_re_encoded(self):
+        first = self._query()
+        cache_file = os.path.join(self.cache_dir.name, self._cache_files()[0])
+        np.save(cache_file, np.ones((2, _StubModel.DIM), dtype=np.float32))
+        self.assertEqual(self._query(), first)
+        self.assertEqual(self._corpus_encodes(), 2)
+
+    def test_cache_is_keyed_by_variant_and_precision(self):
+        self._query()
+        self._query(precision="int8")
+        with mock.patch.object(FoodMatcher, "_load_model", return_value=(self.model, "other")):
+            self._query()
+        self.assertEqual(self._corpus_encodes(), 3)
+        self.assertEqual(len(self._cache_files()), 3)
+
+    def test_relative_cache_dir_resolves_against_project_root(self):
+        matcher = FoodMatcher(EMBEDDING_FOODS, cache_dir=".cache")
+        self.assertEqual(matcher._cache_dir, food_matcher._PROJECT_ROOT / ".cache")
+
+
+if __name__ == "__main__":
+    unittest.main()